@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
 from core.entities import ResultadoBusqueda
+from utils.instrumentacion import INSTRUMENTACION_NULA
 
 class BaseAgent(ABC):
     """Clase base abstracta para todos los agentes de búsqueda."""
     
-    def __init__(self, laberinto):
+    def __init__(self, laberinto, instrumentacion=None):
+        """`instrumentacion` (ver utils.instrumentacion) recibe los tiempos por fase y los contadores."""
         self.laberinto = laberinto
+        self.instrumentacion = instrumentacion or INSTRUMENTACION_NULA
         self.resultado = ResultadoBusqueda()
 
     @abstractmethod
@@ -0,0 +1,162 @@
+import heapq
+import time
+from array import array
+from .base_agent import BaseAgent
+from core.entities import ResultadoBusqueda, MOVIMIENTOS
+
+INFINITO = float('inf')
+
+class DStarLiteAgent(BaseAgent):
+    """
+    Agente que avanza paso a paso por el laberinto mutante usando D* Lite.
+
+    Después de cada paso llama a `mover_muros` del laberinto (que se modifica)
+    y repara su plan solo alrededor de las celdas que cambiaron, en lugar de
+    volver a buscar desde cero. Si en algún momento no existe camino, el agente
+    espera en su lugar a que los muros se muevan.
+    """
+
+    def __init__(self, laberinto, max_pasos=None, instrumentacion=None):
+        super().__init__(laberinto, instrumentacion)
+        self.max_pasos = max_pasos if max_pasos is not None else laberinto.tamaño * laberinto.tamaño
+        self.nodos_expandidos = 0
+        self.replanificaciones = 0
+
+    def _vecinos(self, indice):
+        """Índices planos de las celdas vecinas dentro del laberinto."""
+        tamaño = self.laberinto.tamaño
+        fila, columna = divmod(indice, tamaño)
+        vecinos = []
+        for df, dc in MOVIMIENTOS:
+            nueva_fila, nueva_columna = fila + df, columna + dc
+            if 0 <= nueva_fila < tamaño and 0 <= nueva_columna < tamaño:
+                vecinos.append(nueva_fila * tamaño + nueva_columna)
+        return vecinos
+
+    def _libre(self, indice):
+        return self.laberinto.es_libre(divmod(indice, self.laberinto.tamaño))
+
+    def _heuristica(self, a, b):
+        """Distancia Manhattan entre dos índices planos."""
+        tamaño = self.laberinto.tamaño
+        fila_a, columna_a = divmod(a, tamaño)
+        fila_b, columna_b = divmod(b, tamaño)
+        return abs(fila_a - fila_b) + abs(columna_a - columna_b)
+
+    def _calcular_clave(self, indice):
+        minimo = min(self.g[indice], self.rhs[indice])
+        return (minimo + self._heuristica(self.actual, indice) + self.km, minimo)
+
+    def _insertar(self, indice, clave):
+        self.claves[indice] = clave
+        heapq.heappush(self.cola, (clave, indice))
+
+    def _clave_tope(self):
+        """Clave mínima de la cola, descartando entradas obsoletas."""
+        while self.cola:
+            clave, indice = self.cola[0]
+            if self.claves.get(indice) == clave:
+                return clave
+            heapq.heappop(self.cola)
+        return (INFINITO, INFINITO)
+
+    def _actualizar_vertice(self, indice):
+        """
+        Recalcula rhs a partir de los vecinos. El costo de entrar a una celda
+        es 1 si está libre e infinito si es muro.
+        """
+        if indice != self.objetivo:
+            self.rhs[indice] = min((1 + self.g[vecino] for vecino in self._vecinos(indice)
+                                    if self._libre(vecino)), default=INFINITO)
+        self.claves.pop(indice, None)
+        if self.g[indice] != self.rhs[indice]:
+            self._insertar(indice, self._calcular_clave(indice))
+
+    def _calcular_camino_mas_corto(self):
+        while (self._clave_tope() < self._calcular_clave(self.actual)
+               or self.rhs[self.actual] != self.g[self.actual]):
+            clave_vieja, indice = heapq.heappop(self.cola)
+            del self.claves[indice]
+            self.nodos_expandidos += 1
+
+            clave_nueva = self._calcular_clave(indice)
+            if clave_vieja < clave_nueva:
+                self._insertar(indice, clave_nueva)
+            elif self.g[indice] > self.rhs[indice]:
+                self.g[indice] = self.rhs[indice]
+                for vecino in self._vecinos(indice):
+                    self._actualizar_vertice(vecino)
+            else:
+                self.g[indice] = INFINITO
+                self._actualizar_vertice(indice)
+                for vecino in self._vecinos(indice):
+                    self._actualizar_vertice(vecino)
+
+    def _siguiente_paso(self):
+        """Vecino libre que minimiza 1 + g, o None si no hay camino."""
+        if self.g[self.actual] == INFINITO:
+            return None
+        candidatos = [vecino for vecino in self._vecinos(self.actual) if self._libre(vecino)]
+        if not candidatos:
+            return None
+        return min(candidatos, key=lambda vecino: self.g[vecino])
+
+    def ejecutar(self):
+        """Avanza hasta la salida real o hasta agotar `max_pasos`."""
+        inicio_tiempo = time.perf_counter()
+        self.instrumentacion.iniciar_memoria()
+
+        tamaño = self.laberinto.tamaño
+        total = tamaño * tamaño
+        self.g = array('d', [INFINITO]) * total
+        self.rhs = array('d', [INFINITO]) * total
+        self.cola = []
+        self.claves = {}
+        self.km = 0
+
+        self.actual = self.laberinto.inicio[0] * tamaño + self.laberinto.inicio[1]
+        self.objetivo = self.laberinto.salida_real[0] * tamaño + self.laberinto.salida_real[1]
+        ultimo = self.actual
+
+        self.rhs[self.objetivo] = 0
+        self._insertar(self.objetivo, (self._heuristica(self.actual, self.objetivo), 0))
+        self._calcular_camino_mas_corto()
+
+        camino = [self.laberinto.inicio]
+        pasos = 0
+        while self.actual != self.objetivo and pasos < self.max_pasos:
+            pasos += 1
+            siguiente = self._siguiente_paso()
+            if siguiente is not None:
+                self.actual = siguiente
+                camino.append(divmod(siguiente, tamaño))
+                if self.actual == self.objetivo:
+                    break
+
+            cambios = self.laberinto.mover_muros()
+            if cambios:
+                self.km += self._heuristica(ultimo, self.actual)
+                ultimo = self.actual
+                afectados = set()
+                for fila, columna in cambios:
+                    afectados.update(self._vecinos(fila * tamaño + columna))
+                for indice in afectados:
+                    self._actualizar_vertice(indice)
+                self.replanificaciones += 1
+                self._calcular_camino_mas_corto()
+
+        tiempo_ejecucion = time.perf_counter() - inicio_tiempo
+        self.instrumentacion.detener_memoria()
+        self.instrumentacion.contar('replanificaciones', self.replanificaciones)
+        exito = self.actual == self.objetivo
+
+        self.resultado = ResultadoBusqueda(
+            exito=exito,
+            longitud_camino=len(camino) if exito else 0,
+            nodos_expandidos=self.nodos_expandidos,
+            tiempo_ejecucion=tiempo_ejecucion,
+            camino=camino,
+            metricas=self.instrumentacion.metricas()
+        )
+
+        return self.resultado
@@ -1,7 +1,122 @@
+import os
 import random
+import hashlib
 import time
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from .base_agent import BaseAgent
-from core.entities import ResultadoBusqueda, MOVIMIENTOS
+from core.entities import ResultadoBusqueda, MOVIMIENTOS, SALIDA_REAL, SALIDA_FALSA
+from utils.instrumentacion import crear_instrumentacion
+
+# Formas de evaluar el fitness de la población:
+#   'vectorizada': toda la población avanza gen a gen con operaciones numpy
+#   'secuencial': un cromosoma a la vez con calcular_fitness
+EVALUACIONES = ('vectorizada', 'secuencial')
+
+# Formas de generar la siguiente población:
+#   'clasica': selección, cruce y mutación cromosoma a cromosoma con random.Random
+#   'vectorizada': la población es una matriz int8 y cada operador actúa sobre toda ella
+REPRODUCCIONES = ('clasica', 'vectorizada')
+
+# Operadores de selección disponibles en la reproducción vectorizada
+SELECCIONES = ('ruleta', 'torneo', 'ranking')
+
+# Distancia a la salida real usada en el fitness:
+#   'manhattan': distancia Manhattan
+#   'campo': distancia real por celdas libres (Maze.campo_distancias); las celdas
+#            sin camino a la salida no aportan al término de distancia
+DISTANCIAS = ('manhattan', 'campo')
+
+# Cada cuántos genes se guarda el estado de la simulación en el caché de prefijos
+BLOQUE_PREFIJOS = 32
+
+# Bytes del resumen que identifica cada prefijo en el caché
+BYTES_CLAVE_PREFIJO = 16
+
+class EstadoPrefijo:
+    """
+    Estado del caminante tras simular un prefijo de cromosoma: celda actual
+    (índice plano), pasos válidos y distancia mínima. Las celdas visitadas se
+    guardan como las nuevas desde el estado anterior de la cadena: cada estado
+    agrega O(BLOQUE_PREFIJOS) celdas, pero mantiene vivos a sus anteriores
+    aunque hayan salido del caché. Con `cache_prefijos` estados la memoria es
+    O(cache_prefijos * longitud_cromosoma) en el peor caso, cuando las
+    cadenas no comparten estados.
+    """
+
+    def __init__(self, celda, pasos_validos, distancia_minima, nuevas, anterior):
+        self.celda = celda
+        self.pasos_validos = pasos_validos
+        self.distancia_minima = distancia_minima
+        self.nuevas = nuevas
+        self.anterior = anterior
+
+    def visitados(self):
+        """Conjunto de celdas visitadas hasta este estado."""
+        visitados = set()
+        estado = self
+        while estado is not None:
+            visitados.update(estado.nuevas)
+            estado = estado.anterior
+        return visitados
+
+# Agente y evento de parada compartidos por cada proceso del modelo de islas
+_AGENTE_ISLA = None
+_DETENER_ISLAS = None
+
+def _inicializar_isla(agente, detener):
+    """Inicializador de los procesos del modelo de islas."""
+    global _AGENTE_ISLA, _DETENER_ISLAS
+    _AGENTE_ISLA = agente
+    _DETENER_ISLAS = detener
+
+def empaquetar_cromosomas(poblacion):
+    """
+    Empaqueta una matriz de genes (valores 0 a 3) a 2 bits por gen, cuatro
+    genes por byte. Devuelve (bytes, longitud del cromosoma).
+    """
+    genes = np.asarray(poblacion, dtype=np.uint8)
+    cantidad, longitud = genes.shape
+    relleno = -longitud % 4
+    if relleno:
+        genes = np.concatenate([genes, np.zeros((cantidad, relleno), dtype=np.uint8)], axis=1)
+    grupos = genes.reshape(cantidad, -1, 4)
+    datos = (grupos[:, :, 0] << 6) | (grupos[:, :, 1] << 4) | (grupos[:, :, 2] << 2) | grupos[:, :, 3]
+    return datos.tobytes(), longitud
+
+def desempaquetar_cromosomas(datos, longitud):
+    """Inverso de empaquetar_cromosomas: devuelve la matriz int8 (individuos, genes)."""
+    empaquetados = np.frombuffer(datos, dtype=np.uint8).reshape(-1, (longitud + 3) // 4)
+    desplazamientos = np.array([6, 4, 2, 0], dtype=np.uint8)
+    genes = (empaquetados[:, :, None] >> desplazamientos) & 3
+    return genes.reshape(len(empaquetados), -1)[:, :longitud].astype(np.int8)
+
+def _empaquetar_estado(estado):
+    """Estado de una isla con la población empaquetada, para enviarlo entre procesos."""
+    estado = dict(estado)
+    estado['poblacion'] = empaquetar_cromosomas(estado['poblacion'])
+    return estado
+
+def _desempaquetar_estado(estado):
+    """Inverso de _empaquetar_estado."""
+    estado = dict(estado)
+    estado['poblacion'] = desempaquetar_cromosomas(*estado['poblacion'])
+    return estado
+
+def _evolucionar_isla(estado, generaciones):
+    """Evoluciona una isla durante `generaciones` generaciones dentro de un proceso."""
+    agente = _AGENTE_ISLA
+    estado = _desempaquetar_estado(estado)
+    agente.rng = np.random.default_rng()
+    agente.rng.bit_generator.state = estado['rng']
+    # Las métricas de cada bloque vuelven con el estado y se suman en el proceso principal
+    agente.instrumentacion = crear_instrumentacion(agente.instrumentacion.activa)
+    estado = agente._evolucionar(estado, generaciones, mostrar=False, detener=_DETENER_ISLAS)
+    estado['rng'] = agente.rng.bit_generator.state
+    estado['metricas'] = agente.instrumentacion.metricas()
+    return _empaquetar_estado(estado)
 
 class GeneticAgent(BaseAgent):
     """
@@ -9,29 +124,80 @@ class GeneticAgent(BaseAgent):
     """
     
     def __init__(self, laberinto, tamaño_poblacion=100, longitud_cromosoma=50, 
-                 prob_mutacion=0.1, prob_cruce=0.8, max_generaciones=100):
-        super().__init__(laberinto)
+                 prob_mutacion=0.1, prob_cruce=0.8, max_generaciones=100,
+                 evaluacion='vectorizada', reproduccion='clasica', seleccion='ruleta',
+                 tamaño_torneo=3, semilla=None, islas=1, migracion_cada=10, migrantes=2,
+                 procesos=None, verificar_alcance=True, distancia='manhattan', cache_prefijos=0,
+                 memo_generaciones=0, instrumentacion=None):
+        super().__init__(laberinto, instrumentacion)
+        if evaluacion not in EVALUACIONES:
+            raise ValueError(f"La evaluación debe ser una de {EVALUACIONES}")
+        if reproduccion not in REPRODUCCIONES:
+            raise ValueError(f"La reproducción debe ser una de {REPRODUCCIONES}")
+        if seleccion not in SELECCIONES:
+            raise ValueError(f"La selección debe ser una de {SELECCIONES}")
+        if reproduccion == 'clasica' and seleccion != 'ruleta':
+            raise ValueError("La reproducción 'clasica' solo admite selección por ruleta")
+        if distancia not in DISTANCIAS:
+            raise ValueError(f"La distancia debe ser una de {DISTANCIAS}")
+        if islas > 1 and reproduccion != 'vectorizada':
+            raise ValueError("El modelo de islas requiere la reproducción 'vectorizada'")
         self.tamaño_poblacion = tamaño_poblacion
         self.longitud_cromosoma = longitud_cromosoma
         self.prob_mutacion = prob_mutacion
         self.prob_cruce = prob_cruce
         self.max_generaciones = max_generaciones
         self.movimientos = MOVIMIENTOS
+        self.evaluacion = evaluacion
+        self.reproduccion = reproduccion
+        self.seleccion = seleccion
+        self.tamaño_torneo = tamaño_torneo
+        self.semilla = semilla
+        self.rng = np.random.default_rng(semilla)
+        # Generador propio de los operadores de la reproducción clásica
+        self.aleatorio = random.Random(semilla)
+        self.islas = islas
+        self.migracion_cada = migracion_cada
+        self.migrantes = migrantes
+        self.procesos = procesos
+        self.verificar_alcance = verificar_alcance
+        self.distancia = distancia
+        self.cache_prefijos = cache_prefijos
+        self._mapas = None
+        self._tablas = None
+        self._buffers = None
+        self._prefijos = OrderedDict()
+        self.memo_generaciones = memo_generaciones
+        self._memo = {}
+        self._generacion_memo = 0
+        self.aciertos_memo = 0
+        self.fallos_memo = 0
         
         if laberinto.tamaño > 50:
             self.longitud_cromosoma = max(longitud_cromosoma, laberinto.tamaño * 3)
             self.tamaño_poblacion = max(tamaño_poblacion, 200)
     
     def generar_cromosoma(self):
-        """Genera un cromosoma aleatorio (secuencia de movimientos)."""
-        return [random.randint(0, 3) for _ in range(self.longitud_cromosoma)]
+        """Genera un cromosoma aleatorio (secuencia de movimientos, un byte por gen)."""
+        return bytearray(self.aleatorio.randint(0, 3) for _ in range(self.longitud_cromosoma))
+    
+    def generar_poblacion(self):
+        """Genera la población inicial según el modo de reproducción."""
+        if self.reproduccion == 'vectorizada':
+            return self.rng.integers(0, 4, size=(self.tamaño_poblacion, self.longitud_cromosoma),
+                                     dtype=np.int8)
+        return [self.generar_cromosoma() for _ in range(self.tamaño_poblacion)]
     
     def calcular_fitness(self, cromosoma):
         """Calcula el fitness de un cromosoma."""
+        if self.cache_prefijos:
+            return self._calcular_fitness_con_prefijos(cromosoma)
+        
         posicion = self.laberinto.inicio
         pasos_validos = 0
         distancia_minima = float('inf')
         visitados = set([posicion])
+        distancias = self._mapas_laberinto()[2] if self.distancia == 'campo' else None
         
         for movimiento in cromosoma:
             df, dc = self.movimientos[movimiento]
@@ -42,8 +208,11 @@ class GeneticAgent(BaseAgent):
                 pasos_validos += 1
                 visitados.add(posicion)
                 
-                distancia = abs(posicion[0] - self.laberinto.salida_real[0]) + \
-                           abs(posicion[1] - self.laberinto.salida_real[1])
+                if distancias is not None:
+                    distancia = float(distancias[posicion[0] * self.laberinto.tamaño + posicion[1]])
+                else:
+                    distancia = abs(posicion[0] - self.laberinto.salida_real[0]) + \
+                               abs(posicion[1] - self.laberinto.salida_real[1])
                 distancia_minima = min(distancia_minima, distancia)
                 
                 if self.laberinto.es_salida_real(posicion):
@@ -57,13 +226,264 @@ class GeneticAgent(BaseAgent):
         fitness = (self.longitud_cromosoma - distancia_minima) * 5 + pasos_validos + fitness_exploracion
         return max(fitness, 1)
     
+    def _tablas_escalares(self):
+        """Los mapas de _mapas_laberinto como bytes y listas, para indexarlos rápido desde Python."""
+        if self._tablas is None:
+            libres, tipos, distancias = self._mapas_laberinto()
+            self._tablas = (libres.tobytes(), tipos.tobytes(), distancias.tolist())
+        return self._tablas
+    
+    @staticmethod
+    def _claves_prefijos(genes):
+        """
+        Clave de cada prefijo de `genes` de longitud múltiplo de
+        BLOQUE_PREFIJOS: un resumen de BYTES_CLAVE_PREFIJO bytes encadenado
+        bloque a bloque (el del bloque anterior más los genes del bloque), de
+        modo que todas se calculan en O(len(genes)).
+        """
+        claves = []
+        clave = b''
+        for fin in range(BLOQUE_PREFIJOS, len(genes) + 1, BLOQUE_PREFIJOS):
+            clave = hashlib.blake2b(clave + genes[fin - BLOQUE_PREFIJOS:fin],
+                                    digest_size=BYTES_CLAVE_PREFIJO).digest()
+            claves.append(clave)
+        return claves
+    
+    def _buscar_prefijo(self, claves):
+        """Estado guardado del prefijo más largo según `claves` y su longitud (None, 0 si no hay)."""
+        for bloques in range(len(claves), 0, -1):
+            estado = self._prefijos.get(claves[bloques - 1])
+            if estado is not None:
+                self._prefijos.move_to_end(claves[bloques - 1])
+                self.instrumentacion.contar('aciertos_prefijos')
+                return estado, bloques * BLOQUE_PREFIJOS
+        return None, 0
+    
+    def _guardar_prefijo(self, clave, estado):
+        """Guarda el estado de un prefijo, descartando el usado hace más tiempo si no hay lugar."""
+        self._prefijos[clave] = estado
+        self._prefijos.move_to_end(clave)
+        if len(self._prefijos) > self.cache_prefijos:
+            self._prefijos.popitem(last=False)
+    
+    def _calcular_fitness_con_prefijos(self, cromosoma):
+        """
+        Igual que calcular_fitness, pero retomando la simulación desde el
+        prefijo más largo ya simulado.
+
+        Cada BLOQUE_PREFIJOS genes se guarda el estado del caminante bajo la
+        clave del prefijo correspondiente (hasta `cache_prefijos` estados, con
+        descarte LRU). Los hijos de un cruce de un punto y el elitismo comparten
+        prefijos largos con cromosomas ya evaluados, que no se vuelven a
+        simular.
+        """
+        libres, tipos, distancias = self._tablas_escalares()
+        tamaño = self.laberinto.tamaño
+        genes = bytes(cromosoma)
+        claves = self._claves_prefijos(genes)
+        
+        estado, inicio_gen = self._buscar_prefijo(claves)
+        if estado is None:
+            celda = self.laberinto.inicio[0] * tamaño + self.laberinto.inicio[1]
+            pasos_validos = 0
+            distancia_minima = float('inf')
+            visitados = {celda}
+            nuevas = [celda]
+        else:
+            celda = estado.celda
+            pasos_validos = estado.pasos_validos
+            distancia_minima = estado.distancia_minima
+            visitados = estado.visitados()
+            nuevas = []
+        fila, columna = divmod(celda, tamaño)
+        
+        for gen in range(inicio_gen, len(genes)):
+            df, dc = self.movimientos[genes[gen]]
+            nueva_fila, nueva_columna = fila + df, columna + dc
+            
+            if 0 <= nueva_fila < tamaño and 0 <= nueva_columna < tamaño and \
+               libres[nueva_fila * tamaño + nueva_columna]:
+                fila, columna = nueva_fila, nueva_columna
+                celda = fila * tamaño + columna
+                pasos_validos += 1
+                if celda not in visitados:
+                    visitados.add(celda)
+                    nuevas.append(celda)
+                distancia_minima = min(distancia_minima, distancias[celda])
+                
+                if tipos[celda] == SALIDA_REAL:
+                    return 10000 + (self.longitud_cromosoma - pasos_validos)
+                elif tipos[celda] == SALIDA_FALSA:
+                    return 5000 + (self.longitud_cromosoma - pasos_validos)
+            else:
+                pasos_validos -= 0.5
+            
+            if (gen + 1) % BLOQUE_PREFIJOS == 0:
+                estado = EstadoPrefijo(celda, pasos_validos, distancia_minima, nuevas, estado)
+                self._guardar_prefijo(claves[gen // BLOQUE_PREFIJOS], estado)
+                nuevas = []
+        
+        fitness_exploracion = len(visitados) * 2
+        fitness = (self.longitud_cromosoma - distancia_minima) * 5 + pasos_validos + fitness_exploracion
+        return max(fitness, 1)
+    
+    def _mapas_laberinto(self):
+        """
+        Celdas libres, tipo de salida y distancia a la salida real de cada
+        celda (según `distancia`; inf si no hay camino), como arreglos planos.
+        """
+        if self._mapas is None:
+            tamaño = self.laberinto.tamaño
+            libres = np.frombuffer(self.laberinto.mapa_libre(), dtype=np.bool_)
+            tipos = np.zeros(tamaño * tamaño, dtype=np.int8)
+            for fila, columna in self.laberinto.salidas:
+                tipos[fila * tamaño + columna] = SALIDA_FALSA
+            fila_real, columna_real = self.laberinto.salida_real
+            tipos[fila_real * tamaño + columna_real] = SALIDA_REAL
+            if self.distancia == 'campo':
+                distancias = self.laberinto.campo_distancias().reshape(-1).astype(np.float64)
+                distancias[distancias < 0] = np.inf
+            else:
+                filas, columnas = np.divmod(np.arange(tamaño * tamaño), tamaño)
+                distancias = (np.abs(filas - fila_real) + np.abs(columnas - columna_real)).astype(np.float64)
+            self._mapas = (libres, tipos, distancias)
+        return self._mapas
+    
+    def calcular_fitness_poblacion(self, poblacion):
+        """
+        Calcula el fitness de toda la población a la vez.
+
+        La población se trata como una matriz (individuos, genes) y todos los
+        caminantes avanzan un gen por iteración con indexación de arreglos. El
+        resultado coincide con aplicar calcular_fitness a cada cromosoma.
+        """
+        genes = np.asarray(poblacion, dtype=np.int8)
+        cantidad, longitud = genes.shape
+        tamaño = self.laberinto.tamaño
+        libres, tipos, distancias = self._mapas_laberinto()
+        desplazamientos = np.array(self.movimientos, dtype=np.int64)
+        
+        filas = np.full(cantidad, self.laberinto.inicio[0], dtype=np.int64)
+        columnas = np.full(cantidad, self.laberinto.inicio[1], dtype=np.int64)
+        pasos_validos = np.zeros(cantidad)
+        distancia_minima = np.full(cantidad, np.inf)
+        fitness = np.zeros(cantidad)
+        activos = np.ones(cantidad, dtype=bool)
+        recorrido = np.empty((cantidad, longitud + 1), dtype=np.int64)
+        recorrido[:, 0] = filas * tamaño + columnas
+        
+        for gen in range(longitud):
+            movimiento = desplazamientos[genes[:, gen]]
+            nuevas_filas = filas + movimiento[:, 0]
+            nuevas_columnas = columnas + movimiento[:, 1]
+            
+            dentro = (nuevas_filas >= 0) & (nuevas_filas < tamaño) & \
+                     (nuevas_columnas >= 0) & (nuevas_columnas < tamaño)
+            indices = np.where(dentro, nuevas_filas * tamaño + nuevas_columnas, 0)
+            validos = activos & dentro & libres[indices]
+            invalidos = activos & ~validos
+            
+            filas = np.where(validos, nuevas_filas, filas)
+            columnas = np.where(validos, nuevas_columnas, columnas)
+            pasos_validos += validos
+            pasos_validos -= 0.5 * invalidos
+            
+            actuales = filas * tamaño + columnas
+            distancia_minima = np.where(validos, np.minimum(distancia_minima, distancias[actuales]), distancia_minima)
+            recorrido[:, gen + 1] = actuales
+            
+            salidas = np.where(validos, tipos[indices], 0)
+            if salidas.any():
+                reales = salidas == SALIDA_REAL
+                falsas = salidas == SALIDA_FALSA
+                fitness[reales] = 10000 + (self.longitud_cromosoma - pasos_validos[reales])
+                fitness[falsas] = 5000 + (self.longitud_cromosoma - pasos_validos[falsas])
+                activos &= salidas == 0
+                if not activos.any():
+                    break
+        
+        # Celdas distintas visitadas: se ordena cada recorrido y se cuentan los cambios
+        ordenados = np.sort(recorrido[activos], axis=1)
+        visitados = 1 + np.count_nonzero(ordenados[:, 1:] != ordenados[:, :-1], axis=1)
+        fitness_exploracion = visitados * 2
+        restantes = (self.longitud_cromosoma - distancia_minima[activos]) * 5 + \
+                    pasos_validos[activos] + fitness_exploracion
+        fitness[activos] = np.maximum(restantes, 1)
+        return fitness
+    
+    def evaluar_poblacion(self, poblacion):
+        """
+        Devuelve la lista de fitness de la población según el modo de evaluación.
+
+        Con `cache_prefijos` cada cromosoma se evalúa con
+        _calcular_fitness_con_prefijos también en la evaluación 'vectorizada',
+        que no puede retomar la simulación desde un prefijo.
+        """
+        if self.memo_generaciones:
+            return self._evaluar_con_memo(poblacion)
+        self.instrumentacion.contar('evaluaciones_fitness', len(poblacion))
+        if self._evaluacion_vectorizada():
+            return self.calcular_fitness_poblacion(poblacion).tolist()
+        return [self.calcular_fitness(ind) for ind in poblacion]
+    
+    def _evaluacion_vectorizada(self):
+        """Si la población se evalúa con calcular_fitness_poblacion (ver evaluar_poblacion)."""
+        return self.evaluacion == 'vectorizada' and not self.cache_prefijos
+    
+    def _evaluar_con_memo(self, poblacion):
+        """
+        evaluar_poblacion con memoización del fitness por cromosoma.
+
+        La clave es el cromosoma como bytes (un gen por byte). Solo se evalúan
+        los cromosomas que no están en el memo, una vez cada uno aunque estén
+        repetidos en la población; el resto cuenta como acierto. Las entradas
+        que no se usan durante más de `memo_generaciones` evaluaciones se
+        descartan.
+        """
+        self._generacion_memo += 1
+        generacion = self._generacion_memo
+        if self.evaluacion == 'vectorizada':
+            genes = np.asarray(poblacion, dtype=np.int8)
+            claves = [fila.tobytes() for fila in genes]
+        else:
+            claves = [bytes(cromosoma) for cromosoma in poblacion]
+        
+        fitnesses = [None] * len(claves)
+        pendientes = {}
+        for i, clave in enumerate(claves):
+            entrada = self._memo.get(clave)
+            if entrada is not None:
+                entrada[1] = generacion
+                fitnesses[i] = entrada[0]
+            else:
+                pendientes.setdefault(clave, []).append(i)
+        
+        if pendientes:
+            primeros = [indices[0] for indices in pendientes.values()]
+            if self._evaluacion_vectorizada():
+                calculados = self.calcular_fitness_poblacion(genes[primeros]).tolist()
+            else:
+                calculados = [self.calcular_fitness(poblacion[i]) for i in primeros]
+            for (clave, indices), fitness in zip(pendientes.items(), calculados):
+                self._memo[clave] = [fitness, generacion]
+                for i in indices:
+                    fitnesses[i] = fitness
+        
+        self.fallos_memo += len(pendientes)
+        self.aciertos_memo += len(claves) - len(pendientes)
+        self.instrumentacion.contar('evaluaciones_fitness', len(pendientes))
+        
+        limite = generacion - self.memo_generaciones
+        self._memo = {clave: entrada for clave, entrada in self._memo.items() if entrada[1] >= limite}
+        return fitnesses
+    
     def seleccion_ruleta(self, poblacion, fitnesses):
         """Selección por ruleta."""
         total_fitness = sum(fitnesses)
         if total_fitness == 0:
-            return random.choice(poblacion)
+            return self.aleatorio.choice(poblacion)
         
-        punto = random.uniform(0, total_fitness)
+        punto = self.aleatorio.uniform(0, total_fitness)
         acumulado = 0
         
         for i, fitness in enumerate(fitnesses):
@@ -75,8 +495,8 @@ class GeneticAgent(BaseAgent):
     
     def cruce(self, padre1, padre2):
         """Cruce de un punto."""
-        if random.random() < self.prob_cruce:
-            punto = random.randint(1, self.longitud_cromosoma - 1)
+        if self.aleatorio.random() < self.prob_cruce:
+            punto = self.aleatorio.randint(1, self.longitud_cromosoma - 1)
             hijo1 = padre1[:punto] + padre2[punto:]
             hijo2 = padre2[:punto] + padre1[punto:]
             return hijo1, hijo2
@@ -87,83 +507,327 @@ class GeneticAgent(BaseAgent):
         """Mutación de un gen aleatorio."""
         cromosoma_mutado = cromosoma.copy()
         for i in range(len(cromosoma_mutado)):
-            if random.random() < self.prob_mutacion:
-                cromosoma_mutado[i] = random.randint(0, 3)
+            if self.aleatorio.random() < self.prob_mutacion:
+                cromosoma_mutado[i] = self.aleatorio.randint(0, 3)
         return cromosoma_mutado
     
-    def ejecutar(self):
-        """Ejecuta el algoritmo genético completo."""
-        inicio_tiempo = time.time()
+    def seleccionar_padres(self, fitnesses, cantidad):
+        """
+        Índices de `cantidad` padres elegidos de una vez con el operador configurado.
+
+        - ruleta: suma acumulada de fitness y búsqueda binaria de puntos uniformes.
+        - torneo: el mejor de `tamaño_torneo` individuos sorteados.
+        - ranking: ruleta sobre la posición (1..N) de cada individuo ordenado por fitness.
+        """
+        fitnesses = np.asarray(fitnesses, dtype=np.float64)
+        tamaño = fitnesses.size
         
-        poblacion = [self.generar_cromosoma() for _ in range(self.tamaño_poblacion)]
-        mejor_fitness_historico = 0
-        mejor_cromosoma = None
-        generacion_mejor = 0
+        if self.seleccion == 'torneo':
+            candidatos = self.rng.integers(0, tamaño, size=(cantidad, self.tamaño_torneo))
+            ganadores = np.argmax(fitnesses[candidatos], axis=1)
+            return candidatos[np.arange(cantidad), ganadores]
         
-        print(f"Ejecutando algoritmo genético para laberinto {self.laberinto.tamaño}x{self.laberinto.tamaño}")
-        print(f"Población: {self.tamaño_poblacion}, Cromosoma: {self.longitud_cromosoma}, Generaciones: {self.max_generaciones}")
+        if self.seleccion == 'ranking':
+            pesos = np.empty(tamaño)
+            pesos[np.argsort(fitnesses, kind='stable')] = np.arange(1, tamaño + 1)
+        else:
+            pesos = fitnesses
+        
+        acumulado = np.cumsum(pesos)
+        total = acumulado[-1]
+        if total == 0:
+            return self.rng.integers(0, tamaño, size=cantidad)
+        puntos = self.rng.uniform(0, total, size=cantidad)
+        return np.minimum(np.searchsorted(acumulado, puntos, side='left'), tamaño - 1)
+    
+    def cruce_poblacion(self, padres1, padres2):
+        """
+        Cruce de un punto para todas las parejas a la vez.
+
+        Cada pareja cruza con probabilidad `prob_cruce` en un punto propio; la
+        máscara de corte indica qué genes toma cada hijo de su primer padre.
+        Los padres se reemplazan por los hijos en el lugar (intercambiando con
+        XOR los genes fuera de la máscara) y se devuelven.
+        """
+        parejas, longitud = padres1.shape
+        cruzan = self.rng.random(parejas) < self.prob_cruce
+        puntos = self.rng.integers(1, longitud, size=parejas)
+        intercambio = (np.arange(longitud) >= puntos[:, None]) & cruzan[:, None]
+        np.bitwise_xor(padres1, padres2, out=padres1, where=intercambio)
+        np.bitwise_xor(padres2, padres1, out=padres2, where=intercambio)
+        np.bitwise_xor(padres1, padres2, out=padres1, where=intercambio)
+        return padres1, padres2
+    
+    def mutacion_poblacion(self, poblacion):
+        """Mutación de toda la población con una única máscara de Bernoulli (modifica la matriz)."""
+        mascara = self.rng.random(poblacion.shape) < self.prob_mutacion
+        poblacion[mascara] = self.rng.integers(0, 4, size=np.count_nonzero(mascara), dtype=np.int8)
+        return poblacion
+    
+    def _reproduccion_clasica(self, poblacion, fitnesses, mejor_cromosoma):
+        """Genera la siguiente población cromosoma a cromosoma."""
+        nueva_poblacion = []
+        
+        if mejor_cromosoma is not None:
+            nueva_poblacion.append(mejor_cromosoma)
+        
+        instrumentacion = self.instrumentacion
+        medir = instrumentacion.activa
+        reloj = time.perf_counter_ns
+        
+        while len(nueva_poblacion) < self.tamaño_poblacion:
+            if medir:
+                inicio = reloj()
+            padre1 = self.seleccion_ruleta(poblacion, fitnesses)
+            padre2 = self.seleccion_ruleta(poblacion, fitnesses)
+            if medir:
+                seleccionados = reloj()
+            
+            hijo1, hijo2 = self.cruce(padre1, padre2)
+            if medir:
+                cruzados = reloj()
+            hijo1 = self.mutacion(hijo1)
+            hijo2 = self.mutacion(hijo2)
+            if medir:
+                instrumentacion.sumar_tiempo('seleccion', seleccionados - inicio)
+                instrumentacion.sumar_tiempo('cruce', cruzados - seleccionados)
+                instrumentacion.sumar_tiempo('mutacion', reloj() - cruzados)
+            
+            nueva_poblacion.extend([hijo1, hijo2])
+        
+        return nueva_poblacion[:self.tamaño_poblacion]
+    
+    def _buffer_siguiente(self, poblacion, filas):
+        """
+        Matriz preasignada donde escribir la próxima generación. Se alternan
+        dos matrices (generación actual y siguiente), así que cada generación
+        reutiliza la memoria de la anterior en lugar de pedir una nueva.
+        """
+        forma = (filas, poblacion.shape[1])
+        if self._buffers is None or self._buffers[0].shape != forma:
+            self._buffers = [np.empty(forma, dtype=np.int8) for _ in range(2)]
+        for buffer in self._buffers:
+            if not np.may_share_memory(buffer, poblacion):
+                return buffer
+    
+    def _reproduccion_vectorizada(self, poblacion, fitnesses, mejor_cromosoma):
+        """
+        Genera la siguiente población con operadores sobre la matriz completa.
+
+        Los primeros y los segundos padres de cada pareja se copian en dos
+        bloques contiguos del buffer siguiente. np.take escribe directamente
+        en `out` solo si es contiguo y con mode='clip' (los índices ya son
+        válidos); con filas alternadas o con mode='raise' pasa por una matriz
+        temporal del tamaño de `out`.
+        """
+        elite = 0 if mejor_cromosoma is None else 1
+        parejas = (self.tamaño_poblacion - elite + 1) // 2
+        
+        with self.instrumentacion.fase('seleccion'):
+            padres = self.seleccionar_padres(fitnesses, 2 * parejas)
+            nueva_poblacion = self._buffer_siguiente(poblacion, elite + 2 * parejas)
+            hijos1 = nueva_poblacion[elite:elite + parejas]
+            hijos2 = nueva_poblacion[elite + parejas:]
+            np.take(poblacion, padres[:parejas], axis=0, out=hijos1, mode='clip')
+            np.take(poblacion, padres[parejas:], axis=0, out=hijos2, mode='clip')
+        with self.instrumentacion.fase('cruce'):
+            self.cruce_poblacion(hijos1, hijos2)
+        with self.instrumentacion.fase('mutacion'):
+            self.mutacion_poblacion(nueva_poblacion[elite:])
+        if elite:
+            nueva_poblacion[0] = mejor_cromosoma
         
-        for generacion in range(self.max_generaciones):
-            fitnesses = [self.calcular_fitness(ind) for ind in poblacion]
+        return nueva_poblacion[:self.tamaño_poblacion]
+    
+    def _estado_inicial(self, poblacion):
+        """Estado de una evolución: población actual, mejor individuo y generaciones evaluadas."""
+        return {
+            'poblacion': poblacion,
+            'mejor_fitness': 0,
+            'mejor_cromosoma': None,
+            'generacion_mejor': 0,
+            'generaciones': 0,
+            'migrantes': None,
+            'aciertos_memo': 0,
+            'fallos_memo': 0
+        }
+    
+    def _evolucionar(self, estado, generaciones, mostrar=True, detener=None):
+        """
+        Avanza `generaciones` generaciones a partir de `estado` y lo devuelve actualizado.
+
+        Se detiene antes si se encuentra la salida real (fitness >= 10000) o si
+        `detener` (un evento compartido entre islas) está activado.
+        """
+        poblacion = estado['poblacion']
+        aciertos, fallos = self.aciertos_memo, self.fallos_memo
+        
+        for _ in range(generaciones):
+            if detener is not None and detener.is_set():
+                break
+            
+            generacion = estado['generaciones']
+            with self.instrumentacion.fase('fitness'):
+                fitnesses = self.evaluar_poblacion(poblacion)
+            estado['generaciones'] += 1
             
             max_fitness = max(fitnesses)
-            if max_fitness > mejor_fitness_historico:
-                mejor_fitness_historico = max_fitness
-                mejor_cromosoma = poblacion[fitnesses.index(max_fitness)]
-                generacion_mejor = generacion
+            if max_fitness > estado['mejor_fitness']:
+                estado['mejor_fitness'] = max_fitness
+                estado['mejor_cromosoma'] = poblacion[fitnesses.index(max_fitness)].copy()
+                estado['generacion_mejor'] = generacion
             
-            if generacion % 10 == 0:
+            if mostrar and generacion % 10 == 0:
                 avg_fitness = sum(fitnesses) / len(fitnesses)
-                print(f"Generación {generacion}: Mejor fitness = {mejor_fitness_historico:.1f}, Promedio = {avg_fitness:.1f}")
+                print(f"Generación {generacion}: Mejor fitness = {estado['mejor_fitness']:.1f}, Promedio = {avg_fitness:.1f}")
             
-            if mejor_fitness_historico >= 10000:
-                print(f"¡Solución encontrada en la generación {generacion}!")
+            if estado['mejor_fitness'] >= 10000:
+                if mostrar:
+                    print(f"¡Solución encontrada en la generación {generacion}!")
+                if detener is not None:
+                    detener.set()
                 break
             
-            nueva_poblacion = []
-            
-            if mejor_cromosoma:
-                nueva_poblacion.append(mejor_cromosoma)
+            if self.islas > 1:
+                mejores = np.argsort(fitnesses, kind='stable')[-self.migrantes:]
+                estado['migrantes'] = poblacion[mejores].copy()
             
-            while len(nueva_poblacion) < self.tamaño_poblacion:
-                padre1 = self.seleccion_ruleta(poblacion, fitnesses)
-                padre2 = self.seleccion_ruleta(poblacion, fitnesses)
+            if self.reproduccion == 'vectorizada':
+                poblacion = self._reproduccion_vectorizada(poblacion, fitnesses, estado['mejor_cromosoma'])
+            else:
+                poblacion = self._reproduccion_clasica(poblacion, fitnesses, estado['mejor_cromosoma'])
+        
+        estado['poblacion'] = poblacion
+        estado['aciertos_memo'] += self.aciertos_memo - aciertos
+        estado['fallos_memo'] += self.fallos_memo - fallos
+        return estado
+    
+    def _migrar(self, estados):
+        """Migración en anillo: cada isla reemplaza sus últimos individuos por los mejores de la anterior."""
+        migrantes = [estado['migrantes'] for estado in estados]
+        for i, estado in enumerate(estados):
+            recibidos = migrantes[i - 1]
+            if recibidos is not None and len(recibidos) < len(estado['poblacion']):
+                estado['poblacion'][-len(recibidos):] = recibidos
+    
+    def _ejecutar_islas(self):
+        """
+        Modelo de islas: cada subpoblación evoluciona en su propio proceso.
+
+        Cada `migracion_cada` generaciones las islas intercambian sus
+        `migrantes` mejores cromosomas en anillo. Cuando una isla encuentra la
+        salida real activa un evento compartido y todas se detienen.
+        """
+        estados = []
+        for secuencia in np.random.SeedSequence(self.semilla).spawn(self.islas):
+            rng = np.random.default_rng(secuencia)
+            poblacion = rng.integers(0, 4, size=(self.tamaño_poblacion, self.longitud_cromosoma),
+                                     dtype=np.int8)
+            estado = self._estado_inicial(poblacion)
+            estado['rng'] = rng.bit_generator.state
+            estados.append(estado)
+        
+        contexto = multiprocessing.get_context()
+        detener = contexto.Event()
+        procesos = self.procesos or min(self.islas, os.cpu_count() or 1)
+        
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                                 initializer=_inicializar_isla, initargs=(self, detener)) as ejecutor:
+            generacion = 0
+            while generacion < self.max_generaciones and not detener.is_set():
+                bloque = min(self.migracion_cada, self.max_generaciones - generacion)
+                # Las poblaciones viajan entre procesos a 2 bits por gen
+                enviados = [_empaquetar_estado(estado) for estado in estados]
+                estados = [_desempaquetar_estado(estado) for estado in
+                           ejecutor.map(_evolucionar_isla, enviados, [bloque] * self.islas)]
+                generacion += bloque
                 
-                hijo1, hijo2 = self.cruce(padre1, padre2)
-                hijo1 = self.mutacion(hijo1)
-                hijo2 = self.mutacion(hijo2)
+                mejor = max(estado['mejor_fitness'] for estado in estados)
+                print(f"Generación {generacion}: Mejor fitness entre {self.islas} islas = {mejor:.1f}")
                 
-                nueva_poblacion.extend([hijo1, hijo2])
-            
-            poblacion = nueva_poblacion[:self.tamaño_poblacion]
+                if not detener.is_set():
+                    self._migrar(estados)
+        
+        mejor_estado = max(estados, key=lambda estado: estado['mejor_fitness'])
+        mejor_estado['generaciones'] = max(estado['generaciones'] for estado in estados)
+        mejor_estado['aciertos_memo'] = sum(estado['aciertos_memo'] for estado in estados)
+        mejor_estado['fallos_memo'] = sum(estado['fallos_memo'] for estado in estados)
+        for estado in estados:
+            self.instrumentacion.combinar(estado.pop('metricas', None))
+        if detener.is_set():
+            print(f"¡Solución encontrada en la generación {mejor_estado['generacion_mejor']}!")
+        return mejor_estado
+    
+    def ejecutar(self):
+        """Ejecuta el algoritmo genético completo."""
+        inicio_tiempo = time.perf_counter()
+        self.instrumentacion.iniciar_memoria()
+        self._mapas = None
+        self._tablas = None
+        self._prefijos.clear()
+        self._memo = {}
+        
+        print(f"Ejecutando algoritmo genético para laberinto {self.laberinto.tamaño}x{self.laberinto.tamaño}")
+        print(f"Población: {self.tamaño_poblacion}, Cromosoma: {self.longitud_cromosoma}, Generaciones: {self.max_generaciones}")
+        
+        if self.verificar_alcance and not self.laberinto.es_resoluble():
+            print("La salida real no es alcanzable desde el inicio: se omite la evolución")
+            self.instrumentacion.detener_memoria()
+            self.resultado = ResultadoBusqueda(
+                exito=False,
+                longitud_camino=1,
+                fitness_final=0,
+                generaciones=0,
+                tiempo_ejecucion=time.perf_counter() - inicio_tiempo,
+                camino=[self.laberinto.inicio],
+                metricas=self.instrumentacion.metricas()
+            )
+            return self.resultado
+        
+        if self.islas > 1:
+            estado = self._ejecutar_islas()
+        else:
+            estado = self._evolucionar(self._estado_inicial(self.generar_poblacion()), self.max_generaciones)
+        
+        mejor_fitness_historico = estado['mejor_fitness']
+        mejor_cromosoma = estado['mejor_cromosoma']
+        generacion_mejor = estado['generacion_mejor']
         
-        tiempo_ejecucion = time.time() - inicio_tiempo
+        tiempo_ejecucion = time.perf_counter() - inicio_tiempo
         
         # Reconstruir el camino del mejor cromosoma
         camino = [self.laberinto.inicio]
         posicion = self.laberinto.inicio
         
-        if mejor_cromosoma:
-            for movimiento in mejor_cromosoma:
-                df, dc = self.movimientos[movimiento]
-                nueva_pos = (posicion[0] + df, posicion[1] + dc)
-                if self.laberinto.es_libre(nueva_pos):
-                    posicion = nueva_pos
-                    camino.append(posicion)
-                    
-                    if self.laberinto.es_salida_real(posicion):
-                        break
+        with self.instrumentacion.fase('reconstruccion'):
+            if mejor_cromosoma is not None:
+                for movimiento in mejor_cromosoma:
+                    df, dc = self.movimientos[movimiento]
+                    nueva_pos = (posicion[0] + df, posicion[1] + dc)
+                    if self.laberinto.es_libre(nueva_pos):
+                        posicion = nueva_pos
+                        camino.append(posicion)
+                        
+                        if self.laberinto.es_salida_real(posicion):
+                            break
+        self.instrumentacion.detener_memoria()
+        self.instrumentacion.contar('aciertos_memo', estado['aciertos_memo'])
         
         self.resultado = ResultadoBusqueda(
             exito=mejor_fitness_historico >= 10000,
             longitud_camino=len(camino),
             fitness_final=mejor_fitness_historico,
-            generaciones=min(generacion + 1, self.max_generaciones),
+            generaciones=estado['generaciones'],
             tiempo_ejecucion=tiempo_ejecucion,
-            camino=camino
+            camino=camino,
+            aciertos_memo=estado['aciertos_memo'],
+            fallos_memo=estado['fallos_memo'],
+            metricas=self.instrumentacion.metricas()
         )
         
         print(f"Algoritmo genético completado en {tiempo_ejecucion:.2f}s")
         print(f"Mejor fitness: {mejor_fitness_historico:.1f} (encontrado en generación {generacion_mejor})")
+        if self.memo_generaciones:
+            print(f"Memo de fitness: {estado['aciertos_memo']} aciertos, {estado['fallos_memo']} evaluaciones")
         
         return self.resultado
\ No newline at end of file
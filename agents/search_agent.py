@@ -1,64 +1,647 @@
 import heapq
+import random
 import time
+from array import array
+from collections import deque
 from .base_agent import BaseAgent
-from core.entities import ResultadoBusqueda
+from core.entities import ResultadoBusqueda, MOVIMIENTOS
+from utils.instrumentacion import cronometrar
+
+# Modos de búsqueda:
+#   'salida_real': A* hacia la salida real (el agente sabe cuál es)
+#   'multiobjetivo': el agente no sabe cuál salida es la real y las sondea en orden
+MODOS_BUSQUEDA = ('salida_real', 'multiobjetivo')
+
+# Heurísticas de A* hacia la salida real:
+#   'manhattan': distancia Manhattan
+#   'campo': distancia real precalculada por el laberinto (Maze.campo_distancias)
+HEURISTICAS = ('manhattan', 'campo')
+
+# Estrategias de búsqueda hacia la salida real (modo 'salida_real'):
+#   'a_estrella': A* con la heurística elegida
+#   'jps': Jump Point Search en 4-vecindad
+#   'bidireccional': A* desde el inicio y desde la salida a la vez
+#   'bfs': búsqueda en anchura, como línea base
+ESTRATEGIAS = ('a_estrella', 'jps', 'bidireccional', 'bfs')
+
+# Hasta esta cantidad de salidas el orden de sondeo se optimiza de forma exacta
+MAX_SALIDAS_ORDEN_EXACTO = 12
 
 class SearchAgent(BaseAgent):
-    def __init__(self, laberinto):
-        super().__init__(laberinto)
+    def __init__(self, laberinto, modo='salida_real', verificar_alcance=True, tipo_heuristica='manhattan',
+                 estrategia='a_estrella', semilla=None, instrumentacion=None):
+        """
+        Con `semilla`, A* desempata al azar (con su propio random.Random) los
+        nodos que empatan en f y en el criterio de desempate; sin ella el orden
+        es determinista. `instrumentacion` registra los tiempos de la
+        heurística, de la cola y de la reconstrucción del camino.
+        """
+        super().__init__(laberinto, instrumentacion)
+        if modo not in MODOS_BUSQUEDA:
+            raise ValueError(f"El modo de búsqueda debe ser uno de {MODOS_BUSQUEDA}")
+        if tipo_heuristica not in HEURISTICAS:
+            raise ValueError(f"La heurística debe ser una de {HEURISTICAS}")
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"La estrategia de búsqueda debe ser una de {ESTRATEGIAS}")
+        if modo == 'multiobjetivo' and estrategia != 'a_estrella':
+            raise ValueError("El modo 'multiobjetivo' no admite otras estrategias de búsqueda")
+        self.modo = modo
+        self.tipo_heuristica = tipo_heuristica
+        self.estrategia = estrategia
+        self.verificar_alcance = verificar_alcance
+        self.rng = random.Random(semilla) if semilla is not None else None
         self.nodos_expandidos = 0
         
     def heuristica(self, posicion):
-        """Heurística: distancia Manhattan a la salida real."""
+        """Heurística: distancia Manhattan (o real, con 'campo') a la salida real."""
+        if self.tipo_heuristica == 'campo':
+            return int(self.laberinto.campo_distancias()[posicion])
         fila, columna = posicion
         salida_fila, salida_columna = self.laberinto.salida_real
         return abs(fila - salida_fila) + abs(columna - salida_columna)
     
     def a_estrella(self):
-        """Implementación del algoritmo A*."""
-        inicio = self.laberinto.inicio
-        salida = self.laberinto.salida_real
+        """Implementación del algoritmo A* hacia la salida real."""
+        return self._a_estrella([self.laberinto.salida_real])
+    
+    def a_estrella_multiobjetivo(self, objetivos=None):
+        """A* hacia la salida más cercana de `objetivos` (por defecto, todas las salidas)."""
+        if objetivos is None:
+            objetivos = self.laberinto.salidas
+        return self._a_estrella(objetivos)
+    
+    def _a_estrella(self, objetivos):
+        """
+        Núcleo de A* hacia cualquiera de las posiciones de `objetivos`.
+
+        La heurística es la mínima distancia Manhattan a los objetivos, que con
+        un único objetivo coincide con `heuristica`. Con la heurística 'campo' y
+        la salida real como único objetivo se usa la distancia real: se
+        descartan las celdas sin camino a la salida y, a igual f, se expande
+        primero la celda más cercana a ella. Las posiciones se codifican
+        como índices planos (fila * tamaño + columna); el mejor costo g y el
+        padre de cada celda se guardan en arreglos preasignados, y el camino se
+        reconstruye solo al llegar a un objetivo. Esos arreglos y mapa_libre
+        ocupan unos 10 bytes por celda sea cual sea la representación del
+        laberinto.
+        """
+        tamaño = self.laberinto.tamaño
+        libres = self.laberinto.mapa_libre()
+        inicio = self.laberinto.inicio[0] * tamaño + self.laberinto.inicio[1]
+        objetivos = list(dict.fromkeys(objetivos))
+        if not objetivos:
+            return [], False
+        instrumentacion = self.instrumentacion
+        campo = None
+        if self.tipo_heuristica == 'campo' and objetivos == [self.laberinto.salida_real]:
+            with instrumentacion.fase('heuristica'):
+                campo = memoryview(self.laberinto.campo_distancias().reshape(-1))
+        indices_objetivo = {fila * tamaño + columna for fila, columna in objetivos}
+        # Con un único objetivo la heurística se calcula sin recorrer la lista
+        varios_objetivos = len(objetivos) > 1
+        objetivo_fila, objetivo_columna = objetivos[0]
+        # El desempate aleatorio suma a la clave entera un valor en [0, 1)
+        rng = self.rng
         
-        cola = [(0, 0, inicio, [])]
-        visitados = set()
-        mejor_g = {inicio: 0}
+        total = tamaño * tamaño
+        mejor_g = array('i', [-1]) * total
+        padres = array('i', [-1]) * total
+        visitados = bytearray(total)
+        
+        # Solo con instrumentación se cronometran las operaciones de la cola y la heurística
+        medir = instrumentacion.activa
+        insertar, extraer = heapq.heappush, heapq.heappop
+        if medir:
+            insertar = cronometrar(insertar, instrumentacion, 'cola')
+            extraer = cronometrar(extraer, instrumentacion, 'cola')
+            reloj = time.perf_counter_ns
+        
+        mejor_g[inicio] = 0
+        cola = [(0, 0, inicio)]
+        nodos_previos = self.nodos_expandidos
+        duplicados = 0
+        resultado = [], False
         
         while cola:
-            f, g, actual, camino = heapq.heappop(cola)
+            # El segundo elemento solo desempata; con heurística consistente el
+            # mejor g de una celda es definitivo la primera vez que sale de la cola
+            f, _, actual = extraer(cola)
             self.nodos_expandidos += 1
             
-            if actual in visitados:
+            if visitados[actual]:
+                duplicados += 1
                 continue
                 
-            visitados.add(actual)
-            nuevo_camino = camino + [actual]
+            visitados[actual] = 1
             
-            if actual == salida:
-                return nuevo_camino, True
+            if actual in indices_objetivo:
+                resultado = self._reconstruir_camino(padres, actual), True
+                break
             
-            for vecino in self.laberinto.obtener_vecinos(actual):
-                if vecino not in visitados:
-                    nuevo_g = g + 1
-                    if vecino not in mejor_g or nuevo_g < mejor_g[vecino]:
+            fila, columna = divmod(actual, tamaño)
+            nuevo_g = mejor_g[actual] + 1
+            for df, dc in MOVIMIENTOS:
+                nueva_fila, nueva_columna = fila + df, columna + dc
+                if not (0 <= nueva_fila < tamaño and 0 <= nueva_columna < tamaño):
+                    continue
+                vecino = nueva_fila * tamaño + nueva_columna
+                if libres[vecino] and not visitados[vecino]:
+                    if mejor_g[vecino] < 0 or nuevo_g < mejor_g[vecino]:
+                        if campo is not None:
+                            h = campo[vecino]
+                            if h < 0:
+                                continue
+                            mejor_g[vecino] = nuevo_g
+                            padres[vecino] = actual
+                            insertar(cola, (nuevo_g + h, h if rng is None else h + rng.random(), vecino))
+                            continue
                         mejor_g[vecino] = nuevo_g
-                        nuevo_f = nuevo_g + self.heuristica(vecino)
-                        heapq.heappush(cola, (nuevo_f, nuevo_g, vecino, nuevo_camino))
+                        padres[vecino] = actual
+                        if medir:
+                            inicio_heuristica = reloj()
+                        if varios_objetivos:
+                            h = min(abs(nueva_fila - fila_objetivo) + abs(nueva_columna - columna_objetivo)
+                                    for fila_objetivo, columna_objetivo in objetivos)
+                        else:
+                            h = abs(nueva_fila - objetivo_fila) + abs(nueva_columna - objetivo_columna)
+                        if medir:
+                            instrumentacion.sumar_tiempo('heuristica', reloj() - inicio_heuristica)
+                        insertar(cola, (nuevo_g + h, nuevo_g if rng is None else nuevo_g + rng.random(), vecino))
+        
+        # Cada extracción corresponde a una inserción; las que quedan en la cola también cuentan
+        instrumentacion.contar('inserciones_cola', self.nodos_expandidos - nodos_previos + len(cola))
+        instrumentacion.contar('duplicados_omitidos', duplicados)
+        return resultado
+    
+    def a_estrella_bidireccional(self):
+        """
+        A* bidireccional entre el inicio y la salida real.
+
+        Cada dirección usa la distancia Manhattan al extremo opuesto y se
+        expande siempre la frontera con menos entradas. μ es el costo del mejor
+        camino encontrado al cruzarse ambas búsquedas; la búsqueda termina
+        cuando μ no supera el mayor de los f mínimos de las dos fronteras, ya
+        que cualquier camino sin descubrir cuesta al menos eso.
+        """
+        tamaño = self.laberinto.tamaño
+        instrumentacion = self.instrumentacion
+        libres = self.laberinto.mapa_libre()
+        inicio = self.laberinto.inicio[0] * tamaño + self.laberinto.inicio[1]
+        objetivo = self.laberinto.salida_real[0] * tamaño + self.laberinto.salida_real[1]
+        if inicio == objetivo:
+            return [self.laberinto.inicio], True
+        if not libres[objetivo]:
+            return [], False
+        
+        total = tamaño * tamaño
+        # Índice 0: búsqueda desde el inicio; índice 1: búsqueda desde la salida
+        mejor_g = (array('i', [-1]) * total, array('i', [-1]) * total)
+        padres = (array('i', [-1]) * total, array('i', [-1]) * total)
+        cerrados = (bytearray(total), bytearray(total))
+        destinos = (divmod(objetivo, tamaño), divmod(inicio, tamaño))
+        colas = ([(0, 0, inicio)], [(0, 0, objetivo)])
+        mejor_g[0][inicio] = 0
+        mejor_g[1][objetivo] = 0
+        
+        # Como en _a_estrella, solo con instrumentación se cronometran la cola y la heurística
+        medir = instrumentacion.activa
+        insertar, extraer = heapq.heappush, heapq.heappop
+        if medir:
+            insertar = cronometrar(insertar, instrumentacion, 'cola')
+            extraer = cronometrar(extraer, instrumentacion, 'cola')
+            reloj = time.perf_counter_ns
+        inserciones = 2
+        duplicados = 0
+        
+        mu = float('inf')
+        encuentro = -1
+        while True:
+            for lado in (0, 1):
+                cola, g_lado, cerrado = colas[lado], mejor_g[lado], cerrados[lado]
+                while cola and (cerrado[cola[0][2]] or cola[0][1] > g_lado[cola[0][2]]):
+                    extraer(cola)
+                    duplicados += 1
+            if not colas[0] or not colas[1]:
+                break
+            if mu <= max(colas[0][0][0], colas[1][0][0]):
+                break
+            
+            lado = 0 if len(colas[0]) <= len(colas[1]) else 1
+            cola, g_lado, padres_lado, cerrado = colas[lado], mejor_g[lado], padres[lado], cerrados[lado]
+            g_opuesto = mejor_g[1 - lado]
+            destino_fila, destino_columna = destinos[lado]
+            
+            _, g, actual = extraer(cola)
+            self.nodos_expandidos += 1
+            cerrado[actual] = 1
+            
+            fila, columna = divmod(actual, tamaño)
+            nuevo_g = g + 1
+            for df, dc in MOVIMIENTOS:
+                nueva_fila, nueva_columna = fila + df, columna + dc
+                if not (0 <= nueva_fila < tamaño and 0 <= nueva_columna < tamaño):
+                    continue
+                vecino = nueva_fila * tamaño + nueva_columna
+                if libres[vecino] and not cerrado[vecino]:
+                    if g_lado[vecino] < 0 or nuevo_g < g_lado[vecino]:
+                        g_lado[vecino] = nuevo_g
+                        padres_lado[vecino] = actual
+                        if medir:
+                            inicio_heuristica = reloj()
+                        h = abs(nueva_fila - destino_fila) + abs(nueva_columna - destino_columna)
+                        if medir:
+                            instrumentacion.sumar_tiempo('heuristica', reloj() - inicio_heuristica)
+                        insertar(cola, (nuevo_g + h, nuevo_g, vecino))
+                        inserciones += 1
+                        if g_opuesto[vecino] >= 0 and nuevo_g + g_opuesto[vecino] < mu:
+                            mu = nuevo_g + g_opuesto[vecino]
+                            encuentro = vecino
+        
+        instrumentacion.contar('inserciones_cola', inserciones)
+        instrumentacion.contar('duplicados_omitidos', duplicados)
+        if encuentro < 0:
+            return [], False
+        
+        camino = self._reconstruir_camino(padres[0], encuentro)
+        with instrumentacion.fase('reconstruccion'):
+            indice = padres[1][encuentro]
+            while indice != -1:
+                camino.append(divmod(indice, tamaño))
+                indice = padres[1][indice]
+        return camino, True
+    
+    def jps(self):
+        """
+        Jump Point Search adaptado a 4-vecindad, hacia la salida real.
+
+        Sigue las reglas de la variante sin movimientos diagonales de
+        PathFinding.js: en horizontal una celda es punto de salto si tiene un
+        vecino forzado arriba o abajo; en vertical, además, si desde ella se
+        alcanza un punto de salto avanzando en horizontal. A* solo expande
+        puntos de salto (cada expansión cuenta en `nodos_expandidos`) y el
+        camino se completa celda a celda entre ellos.
+        """
+        tamaño = self.laberinto.tamaño
+        libres = self.laberinto.mapa_libre()
+        objetivo = self.laberinto.salida_real
+        objetivo_fila, objetivo_columna = objetivo
+        
+        def libre(fila, columna):
+            return 0 <= fila < tamaño and 0 <= columna < tamaño and libres[fila * tamaño + columna]
+        
+        def saltar(fila, columna, df, dc):
+            """Avanza en la dirección (df, dc) hasta un punto de salto; None si choca con un muro."""
+            while True:
+                fila, columna = fila + df, columna + dc
+                if not libre(fila, columna):
+                    return None
+                if (fila, columna) == objetivo:
+                    return fila, columna
+                if dc:
+                    if (libre(fila - 1, columna) and not libre(fila - 1, columna - dc)) or \
+                       (libre(fila + 1, columna) and not libre(fila + 1, columna - dc)):
+                        return fila, columna
+                else:
+                    if (libre(fila, columna - 1) and not libre(fila - df, columna - 1)) or \
+                       (libre(fila, columna + 1) and not libre(fila - df, columna + 1)):
+                        return fila, columna
+                    if saltar(fila, columna, 0, 1) or saltar(fila, columna, 0, -1):
+                        return fila, columna
+        
+        inicio = self.laberinto.inicio
+        mejor_g = {inicio: 0}
+        padres = {inicio: None}
+        cerrados = set()
+        cola = [(0, 0, inicio)]
+        
+        # Como en _a_estrella, solo con instrumentación se cronometran la cola y la heurística
+        instrumentacion = self.instrumentacion
+        medir = instrumentacion.activa
+        insertar, extraer = heapq.heappush, heapq.heappop
+        if medir:
+            insertar = cronometrar(insertar, instrumentacion, 'cola')
+            extraer = cronometrar(extraer, instrumentacion, 'cola')
+            reloj = time.perf_counter_ns
+        inserciones = 1
+        duplicados = 0
+        resultado = [], False
+        
+        while cola:
+            _, g, actual = extraer(cola)
+            self.nodos_expandidos += 1
+            
+            if actual in cerrados:
+                duplicados += 1
+                continue
+            cerrados.add(actual)
+            
+            if actual == objetivo:
+                with instrumentacion.fase('reconstruccion'):
+                    resultado = self._completar_saltos(padres, actual), True
+                break
+            
+            fila, columna = actual
+            padre = padres[actual]
+            if padre is None:
+                direcciones = MOVIMIENTOS
+            elif columna != padre[1]:
+                dc = 1 if columna > padre[1] else -1
+                direcciones = ((-1, 0), (1, 0), (0, dc))
+            else:
+                df = 1 if fila > padre[0] else -1
+                direcciones = ((0, -1), (0, 1), (df, 0))
+            
+            for df, dc in direcciones:
+                salto = saltar(fila, columna, df, dc)
+                if salto is None or salto in cerrados:
+                    continue
+                nuevo_g = g + abs(salto[0] - fila) + abs(salto[1] - columna)
+                if salto not in mejor_g or nuevo_g < mejor_g[salto]:
+                    mejor_g[salto] = nuevo_g
+                    padres[salto] = actual
+                    if medir:
+                        inicio_heuristica = reloj()
+                    h = abs(salto[0] - objetivo_fila) + abs(salto[1] - objetivo_columna)
+                    if medir:
+                        instrumentacion.sumar_tiempo('heuristica', reloj() - inicio_heuristica)
+                    insertar(cola, (nuevo_g + h, nuevo_g, salto))
+                    inserciones += 1
         
-        return [], False
+        instrumentacion.contar('inserciones_cola', inserciones)
+        instrumentacion.contar('duplicados_omitidos', duplicados)
+        return resultado
+    
+    def _completar_saltos(self, padres, posicion):
+        """Camino celda a celda desde el inicio a partir de los padres entre puntos de salto."""
+        saltos = []
+        while posicion is not None:
+            saltos.append(posicion)
+            posicion = padres[posicion]
+        saltos.reverse()
+        
+        camino = [saltos[0]]
+        for fila, columna in saltos[1:]:
+            actual_fila, actual_columna = camino[-1]
+            df = (fila > actual_fila) - (fila < actual_fila)
+            dc = (columna > actual_columna) - (columna < actual_columna)
+            while (actual_fila, actual_columna) != (fila, columna):
+                actual_fila, actual_columna = actual_fila + df, actual_columna + dc
+                camino.append((actual_fila, actual_columna))
+        return camino
+    
+    def bfs(self):
+        """
+        Búsqueda en anchura hacia la salida real (línea base sin heurística).
+        Cada celda entra a la cola una sola vez, así que no hay duplicados.
+        """
+        tamaño = self.laberinto.tamaño
+        instrumentacion = self.instrumentacion
+        libres = self.laberinto.mapa_libre()
+        inicio = self.laberinto.inicio[0] * tamaño + self.laberinto.inicio[1]
+        objetivo = self.laberinto.salida_real[0] * tamaño + self.laberinto.salida_real[1]
+        
+        total = tamaño * tamaño
+        padres = array('i', [-1]) * total
+        visitados = bytearray(total)
+        visitados[inicio] = 1
+        cola = deque([inicio])
+        
+        # Solo con instrumentación se cronometran las operaciones de la cola
+        insertar, extraer = cola.append, cola.popleft
+        if instrumentacion.activa:
+            insertar = cronometrar(insertar, instrumentacion, 'cola')
+            extraer = cronometrar(extraer, instrumentacion, 'cola')
+        nodos_previos = self.nodos_expandidos
+        resultado = [], False
+        
+        while cola:
+            actual = extraer()
+            self.nodos_expandidos += 1
+            if actual == objetivo:
+                resultado = self._reconstruir_camino(padres, actual), True
+                break
+            
+            fila, columna = divmod(actual, tamaño)
+            for df, dc in MOVIMIENTOS:
+                nueva_fila, nueva_columna = fila + df, columna + dc
+                if not (0 <= nueva_fila < tamaño and 0 <= nueva_columna < tamaño):
+                    continue
+                vecino = nueva_fila * tamaño + nueva_columna
+                if libres[vecino] and not visitados[vecino]:
+                    visitados[vecino] = 1
+                    padres[vecino] = actual
+                    insertar(vecino)
+        
+        instrumentacion.contar('inserciones_cola', self.nodos_expandidos - nodos_previos + len(cola))
+        instrumentacion.contar('duplicados_omitidos', 0)
+        return resultado
+    
+    def distancias_desde(self, origen, libres=None):
+        """
+        Recorrido BFS completo desde `origen`.
+
+        Devuelve dos arreglos planos (fila * tamaño + columna): la distancia de
+        cada celda a `origen` (-1 si es inalcanzable) y el padre de cada celda
+        en el árbol BFS, que apunta un paso más cerca de `origen`.
+        """
+        tamaño = self.laberinto.tamaño
+        if libres is None:
+            libres = self.laberinto.mapa_libre()
+        
+        total = tamaño * tamaño
+        distancias = array('i', [-1]) * total
+        padres = array('i', [-1]) * total
+        
+        indice_origen = origen[0] * tamaño + origen[1]
+        distancias[indice_origen] = 0
+        cola = deque([indice_origen])
+        
+        while cola:
+            actual = cola.popleft()
+            self.nodos_expandidos += 1
+            
+            fila, columna = divmod(actual, tamaño)
+            nueva_distancia = distancias[actual] + 1
+            for df, dc in MOVIMIENTOS:
+                nueva_fila, nueva_columna = fila + df, columna + dc
+                if not (0 <= nueva_fila < tamaño and 0 <= nueva_columna < tamaño):
+                    continue
+                vecino = nueva_fila * tamaño + nueva_columna
+                if libres[vecino] and distancias[vecino] < 0:
+                    distancias[vecino] = nueva_distancia
+                    padres[vecino] = actual
+                    cola.append(vecino)
+        
+        return distancias, padres
+    
+    def distancias_a_salidas(self, libres=None):
+        """Distancia desde el inicio a cada salida (None si es inalcanzable), con un solo recorrido."""
+        tamaño = self.laberinto.tamaño
+        distancias, _ = self.distancias_desde(self.laberinto.inicio, libres)
+        resultado = {}
+        for fila, columna in self.laberinto.salidas:
+            distancia = distancias[fila * tamaño + columna]
+            resultado[(fila, columna)] = distancia if distancia >= 0 else None
+        return resultado
+    
+    def planificar_sondeo(self):
+        """
+        Ordena las salidas alcanzables para visitarlas sin saber cuál es la real.
+
+        Suponiendo que cada salida tiene la misma probabilidad de ser la real,
+        el costo esperado de un orden es el promedio de las distancias
+        acumuladas al llegar a cada salida. Con pocas salidas el orden óptimo se
+        calcula con programación dinámica sobre subconjuntos; con muchas se usa
+        la salida más cercana en cada paso.
+
+        Devuelve el orden de salidas y, por cada salida, los padres del
+        recorrido BFS desde ella (usados para reconstruir los tramos).
+        """
+        tamaño = self.laberinto.tamaño
+        libres = self.laberinto.mapa_libre()
+        
+        distancias_inicio = self.distancias_a_salidas(libres)
+        salidas = [salida for salida, distancia in distancias_inicio.items() if distancia is not None]
+        if not salidas:
+            return [], {}
+        
+        recorridos = {salida: self.distancias_desde(salida, libres) for salida in salidas}
+        distancia = [[recorridos[destino][0][origen[0] * tamaño + origen[1]] for destino in salidas]
+                     for origen in salidas]
+        desde_inicio = [distancias_inicio[salida] for salida in salidas]
+        
+        if len(salidas) <= MAX_SALIDAS_ORDEN_EXACTO:
+            orden = self._orden_sondeo_exacto(desde_inicio, distancia)
+        else:
+            orden = self._orden_sondeo_voraz(desde_inicio, distancia)
+        
+        padres = {salida: recorridos[salida][1] for salida in salidas}
+        return [salidas[i] for i in orden], padres
+    
+    @staticmethod
+    def _orden_sondeo_exacto(desde_inicio, distancia):
+        """
+        Orden que minimiza la suma de distancias acumuladas de llegada.
+
+        Un tramo recorrido cuando quedan k salidas por visitar suma su largo a
+        las k llegadas siguientes, por lo que el costo se acumula por tramos:
+        costo[subconjunto][última] = min(costo previo + largo * salidas restantes).
+        """
+        cantidad = len(desde_inicio)
+        completo = (1 << cantidad) - 1
+        infinito = float('inf')
+        costo = [[infinito] * cantidad for _ in range(1 << cantidad)]
+        previo = [[-1] * cantidad for _ in range(1 << cantidad)]
+        
+        for i in range(cantidad):
+            costo[1 << i][i] = desde_inicio[i] * cantidad
+        
+        for visitadas in range(1, completo + 1):
+            restantes = cantidad - bin(visitadas).count('1')
+            for ultima in range(cantidad):
+                actual = costo[visitadas][ultima]
+                if actual == infinito:
+                    continue
+                for siguiente in range(cantidad):
+                    if visitadas & (1 << siguiente):
+                        continue
+                    nuevo = actual + distancia[ultima][siguiente] * restantes
+                    nuevas_visitadas = visitadas | (1 << siguiente)
+                    if nuevo < costo[nuevas_visitadas][siguiente]:
+                        costo[nuevas_visitadas][siguiente] = nuevo
+                        previo[nuevas_visitadas][siguiente] = ultima
+        
+        ultima = min(range(cantidad), key=lambda i: costo[completo][i])
+        orden = []
+        visitadas = completo
+        while ultima != -1:
+            orden.append(ultima)
+            anterior = previo[visitadas][ultima]
+            visitadas &= ~(1 << ultima)
+            ultima = anterior
+        orden.reverse()
+        return orden
+    
+    @staticmethod
+    def _orden_sondeo_voraz(desde_inicio, distancia):
+        """Orden que visita siempre la salida pendiente más cercana."""
+        pendientes = set(range(len(desde_inicio)))
+        actual = min(pendientes, key=lambda i: desde_inicio[i])
+        orden = [actual]
+        pendientes.remove(actual)
+        while pendientes:
+            actual = min(pendientes, key=lambda i: distancia[actual][i])
+            orden.append(actual)
+            pendientes.remove(actual)
+        return orden
+    
+    def sondear_salidas(self):
+        """
+        Recorre las salidas en el orden de `planificar_sondeo` hasta dar con la real.
+
+        Cada tramo se reconstruye siguiendo los padres del recorrido BFS desde
+        la salida de destino, que apuntan siempre hacia ella. Si un tramo pasa
+        por la salida real camino a otra salida, el recorrido termina ahí.
+        """
+        tamaño = self.laberinto.tamaño
+        orden, padres = self.planificar_sondeo()
+        salida_real = self.laberinto.salida_real
+        
+        posicion = self.laberinto.inicio
+        camino = [posicion]
+        if posicion == salida_real:
+            return camino, True
+        for salida in orden:
+            padres_salida = padres[salida]
+            indice = padres_salida[posicion[0] * tamaño + posicion[1]]
+            while indice != -1:
+                posicion = divmod(indice, tamaño)
+                camino.append(posicion)
+                if posicion == salida_real:
+                    return camino, True
+                indice = padres_salida[indice]
+        
+        return camino, False
+    
+    def _reconstruir_camino(self, padres, indice):
+        """Reconstruye el camino desde el inicio siguiendo los punteros a los padres."""
+        tamaño = self.laberinto.tamaño
+        camino = []
+        with self.instrumentacion.fase('reconstruccion'):
+            while indice != -1:
+                camino.append(divmod(indice, tamaño))
+                indice = padres[indice]
+            camino.reverse()
+        return camino
     
     def ejecutar(self):
         """Ejecuta la búsqueda y devuelve estadísticas."""
-        inicio_tiempo = time.time()
+        inicio_tiempo = time.perf_counter()
+        self.instrumentacion.iniciar_memoria()
         
-        camino, exito = self.a_estrella()
-        tiempo_ejecucion = time.time() - inicio_tiempo
+        if self.verificar_alcance and not self.laberinto.es_resoluble():
+            # Sin camino a la salida real la búsqueda fallaría tras recorrer toda la componente
+            camino, exito = [], False
+        elif self.modo == 'multiobjetivo':
+            camino, exito = self.sondear_salidas()
+        elif self.estrategia == 'jps':
+            camino, exito = self.jps()
+        elif self.estrategia == 'bidireccional':
+            camino, exito = self.a_estrella_bidireccional()
+        elif self.estrategia == 'bfs':
+            camino, exito = self.bfs()
+        else:
+            camino, exito = self.a_estrella()
+        tiempo_ejecucion = time.perf_counter() - inicio_tiempo
+        self.instrumentacion.detener_memoria()
         
         self.resultado = ResultadoBusqueda(
             exito=exito,
             longitud_camino=len(camino) if exito else 0,
             nodos_expandidos=self.nodos_expandidos,
             tiempo_ejecucion=tiempo_ejecucion,
-            camino=camino
+            camino=camino,
+            metricas=self.instrumentacion.metricas()
         )
         
-        return self.resultado
\ No newline at end of file
+        return self.resultado
@@ -0,0 +1,234 @@
+"""
+Benchmarks de las rutas críticas: generación del laberinto, movimiento de
+muros, A*, fitness del genético, una ejecución completa del genético y los
+primeros pasos de D* Lite con muros móviles.
+
+Cada caso se mide para cada combinación de tamaño y densidad con semillas
+fijas, y se informa el tiempo (mediana y mínimo de varias repeticiones) y el
+rendimiento en unidades por segundo (celdas, nodos expandidos, genes o
+generaciones). Los resultados pueden guardarse como línea base en JSON y
+compararse con una línea base anterior para detectar regresiones:
+
+    python -m benchmarks.suite --guardar base.json
+    python -m benchmarks.suite --comparar base.json --tolerancia 0.2
+    python main.py bench --tamanos 15 50 --casos a_estrella fitness
+    python main.py bench --tamanos 15 50 200 --casos dstar
+
+Con --comparar el proceso termina con código 1 si algún caso es más lento
+que la línea base en más de la tolerancia.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+
+from core.maze import Maze
+from agents.search_agent import SearchAgent
+from agents.genetic_agent import GeneticAgent
+from agents.dstar_agent import DStarLiteAgent
+
+TAMAÑOS = (15, 50, 200, 1000)
+DENSIDADES = (0.1, 0.2, 0.3, 0.4, 0.5)
+SEMILLA = 42
+
+# Cromosomas evaluados por repetición en el caso 'fitness' (evaluación escalar)
+CROMOSOMAS_FITNESS = 20
+
+# Generaciones de la ejecución completa del genético
+GENERACIONES_GENETICO = 10
+
+# Pasos de D* Lite por repetición (cada uno mueve los muros y repara el plan)
+PASOS_DSTAR = 50
+
+VERSION_FORMATO = 1
+
+def _preparar_laberinto(tamaño, densidad, semilla, representacion):
+    return Maze(tamaño, densidad_muros=densidad, semilla=semilla, representacion=representacion)
+
+def _caso_generacion(tamaño, densidad, semilla, representacion):
+    def medir():
+        _preparar_laberinto(tamaño, densidad, semilla, representacion)
+        return tamaño * tamaño
+    return medir, 'celdas'
+
+def _caso_mover_muros(tamaño, densidad, semilla, representacion):
+    laberinto = _preparar_laberinto(tamaño, densidad, semilla, representacion)
+    def medir():
+        laberinto.mover_muros()
+        return tamaño * tamaño
+    return medir, 'celdas'
+
+def _caso_a_estrella(tamaño, densidad, semilla, representacion):
+    laberinto = _preparar_laberinto(tamaño, densidad, semilla, representacion)
+    def medir():
+        agente = SearchAgent(laberinto)
+        agente.a_estrella()
+        return agente.nodos_expandidos
+    return medir, 'nodos'
+
+def _caso_fitness(tamaño, densidad, semilla, representacion):
+    laberinto = _preparar_laberinto(tamaño, densidad, semilla, representacion)
+    agente = GeneticAgent(laberinto, longitud_cromosoma=tamaño * 3, evaluacion='secuencial', semilla=semilla)
+    poblacion = [agente.generar_cromosoma() for _ in range(CROMOSOMAS_FITNESS)]
+    def medir():
+        for cromosoma in poblacion:
+            agente.calcular_fitness(cromosoma)
+        return len(poblacion) * agente.longitud_cromosoma
+    return medir, 'genes'
+
+def _caso_fitness_poblacion(tamaño, densidad, semilla, representacion):
+    laberinto = _preparar_laberinto(tamaño, densidad, semilla, representacion)
+    agente = GeneticAgent(laberinto, longitud_cromosoma=tamaño * 3, semilla=semilla)
+    poblacion = agente.rng.integers(0, 4, size=(agente.tamaño_poblacion, agente.longitud_cromosoma))
+    def medir():
+        agente.calcular_fitness_poblacion(poblacion)
+        return poblacion.size
+    return medir, 'genes'
+
+def _caso_genetico(tamaño, densidad, semilla, representacion):
+    laberinto = _preparar_laberinto(tamaño, densidad, semilla, representacion)
+    def medir():
+        agente = GeneticAgent(laberinto, longitud_cromosoma=tamaño * 3, max_generaciones=GENERACIONES_GENETICO,
+                              reproduccion='vectorizada', semilla=semilla, verificar_alcance=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = agente.ejecutar()
+        return resultado.generaciones
+    return medir, 'generaciones'
+
+def _caso_dstar(tamaño, densidad, semilla, representacion):
+    laberinto = _preparar_laberinto(tamaño, densidad, semilla, representacion)
+    def medir():
+        # D* Lite mueve los muros: cada repetición parte de una copia del mismo laberinto
+        agente = DStarLiteAgent(copy.deepcopy(laberinto), max_pasos=PASOS_DSTAR)
+        agente.ejecutar()
+        return agente.nodos_expandidos
+    return medir, 'nodos'
+
+# Casos disponibles: nombre -> función que prepara (medición, unidad)
+CASOS = {
+    'generacion': _caso_generacion,
+    'mover_muros': _caso_mover_muros,
+    'a_estrella': _caso_a_estrella,
+    'fitness': _caso_fitness,
+    'fitness_poblacion': _caso_fitness_poblacion,
+    'genetico': _caso_genetico,
+    'dstar': _caso_dstar
+}
+
+# Casos que se miden si no se indican --casos. D* Lite es mucho más lento que
+# el resto (unos 30 mil nodos/s) y en 1000x1000 tardaría minutos: se pide aparte
+CASOS_POR_DEFECTO = tuple(caso for caso in CASOS if caso != 'dstar')
+
+def medir(funcion, repeticiones):
+    """Ejecuta `funcion` `repeticiones` veces; devuelve los tiempos y las unidades procesadas por vez."""
+    tiempos = []
+    unidades = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        unidades = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos, unidades
+
+def clave_caso(caso, tamaño, densidad, representacion):
+    return f"{caso}/{tamaño}/{densidad}/{representacion}"
+
+def ejecutar_suite(casos=CASOS_POR_DEFECTO, tamaños=TAMAÑOS, densidades=DENSIDADES, semilla=SEMILLA,
+                   representacion='numpy', repeticiones=5, mostrar=True):
+    """Mide cada caso en cada combinación de tamaño y densidad; devuelve el informe como diccionario."""
+    resultados = {}
+    if mostrar:
+        print(f"{'Caso':<36} {'Mediana':>11} {'Mínimo':>11} {'Rendimiento':>22}")
+
+    for caso in casos:
+        for tamaño in tamaños:
+            for densidad in densidades:
+                medicion, unidad = CASOS[caso](tamaño, densidad, semilla, representacion)
+                tiempos, unidades = medir(medicion, repeticiones)
+                mediana = statistics.median(tiempos)
+                clave = clave_caso(caso, tamaño, densidad, representacion)
+                resultados[clave] = {
+                    'mediana': mediana,
+                    'minimo': min(tiempos),
+                    'unidades': unidades,
+                    'unidad': unidad,
+                    'rendimiento': unidades / mediana if mediana > 0 else None
+                }
+                if mostrar:
+                    rendimiento = resultados[clave]['rendimiento'] or 0
+                    print(f"{clave:<36} {mediana:>10.5f}s {min(tiempos):>10.5f}s "
+                          f"{rendimiento:>14.0f} {unidad}/s")
+
+    return {
+        'version': VERSION_FORMATO,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'semilla': semilla,
+        'repeticiones': repeticiones,
+        'resultados': resultados
+    }
+
+def comparar(informe, base, tolerancia=0.2):
+    """
+    Compara la mediana de cada caso con la de la línea base. Devuelve la
+    lista de regresiones (clave, mediana base, mediana actual) cuyo tiempo
+    supera al de la base en más de `tolerancia` (proporción).
+    """
+    regresiones = []
+    for clave, actual in informe['resultados'].items():
+        anterior = base['resultados'].get(clave)
+        if anterior is None:
+            continue
+        if actual['mediana'] > anterior['mediana'] * (1 + tolerancia):
+            regresiones.append((clave, anterior['mediana'], actual['mediana']))
+    return regresiones
+
+def comando(args):
+    """
+    Ejecuta la suite con las opciones de cli.agregar_opciones_bench; devuelve
+    el código de salida. Las opciones omitidas toman los valores de
+    CASOS_POR_DEFECTO, TAMAÑOS, DENSIDADES y SEMILLA.
+    """
+    casos = args.casos or CASOS_POR_DEFECTO
+    desconocidos = [caso for caso in casos if caso not in CASOS]
+    if desconocidos:
+        raise ValueError(f"Casos desconocidos: {', '.join(desconocidos)}. Deben ser de {tuple(CASOS)}")
+    informe = ejecutar_suite(casos, args.tamanos or TAMAÑOS, args.densidades or DENSIDADES,
+                             SEMILLA if args.semilla is None else args.semilla,
+                             args.representacion, args.repeticiones)
+
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=2)
+        print(f"Línea base guardada en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        regresiones = comparar(informe, base, args.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresiones (más de {args.tolerancia:.0%} más lentas):")
+            for clave, anterior, actual in regresiones:
+                print(f"  {clave}: {anterior:.5f}s -> {actual:.5f}s ({actual / anterior - 1:+.0%})")
+            return 1
+        print("\nSin regresiones respecto de la línea base")
+
+    return 0
+
+def main(argv=None):
+    from cli import agregar_opciones_bench
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite',
+                                     description="Benchmarks de las rutas críticas")
+    agregar_opciones_bench(parser)
+    try:
+        return comando(parser.parse_args(argv))
+    except (ValueError, OSError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Interfaz de línea de comandos no interactiva.
+
+Permite ejecutar los mismos flujos que el menú de main.py en trabajos por
+lotes, sin preguntas por consola:
+
+    python main.py run --tamano 30 --densidad 0.2 --repeticiones 5 --semilla 42
+    python main.py sweep --config configuraciones.json --procesos 8 --exportar resultados.csv
+    python main.py sweep --aleatorias 20 --semilla 7
+    python main.py bench --tamanos 15 50 200 --guardar base.json
+    python main.py plot resultados.jsonl --directorio graficos
+
+Las configuraciones de archivo (JSON o TOML) siguen el esquema de
+CONFIGURACIONES_PREDEFINIDAS (experiments/configuraciones.py): una
+configuración, una lista de ellas o, en TOML, una tabla con una lista
+`configuraciones`.
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+
+CAMPOS_OBLIGATORIOS = ('tamaño', 'densidad_muros', 'cantidad_salidas', 'prob_mover_muro',
+                       'tamaño_poblacion', 'longitud_cromosoma', 'max_generaciones', 'repeticiones')
+
+def cargar_configuraciones(archivo):
+    """Carga una o varias configuraciones desde un archivo JSON o TOML."""
+    if archivo.endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("Leer archivos TOML requiere Python 3.11 o superior")
+        with open(archivo, 'rb') as f:
+            datos = tomllib.load(f)
+    else:
+        with open(archivo, encoding='utf-8') as f:
+            datos = json.load(f)
+
+    if isinstance(datos, dict):
+        datos = datos.get('configuraciones', [datos])
+    return [validar_configuracion(config) for config in datos]
+
+def validar_configuracion(config):
+    """Verifica los campos obligatorios y completa el nombre si falta."""
+    faltantes = [campo for campo in CAMPOS_OBLIGATORIOS if campo not in config]
+    if faltantes:
+        raise ValueError(f"Faltan campos en la configuración: {', '.join(faltantes)}")
+
+    config = dict(config)
+    config.setdefault('nombre', f"{config['tamaño']}x{config['tamaño']}-{config['densidad_muros']}-{config['prob_mover_muro']}")
+    return config
+
+def configuracion_desde_argumentos(args):
+    """Construye una configuración a partir de las opciones del subcomando run."""
+    config = {
+        'tamaño': args.tamano,
+        'densidad_muros': args.densidad,
+        'cantidad_salidas': args.salidas,
+        'prob_mover_muro': args.prob_mover,
+        'tamaño_poblacion': args.poblacion,
+        'longitud_cromosoma': args.cromosoma if args.cromosoma is not None else args.tamano * 3,
+        'max_generaciones': args.generaciones,
+        'repeticiones': args.repeticiones,
+        'semilla_base': args.semilla,
+        'representacion': args.representacion
+    }
+    if args.nombre:
+        config['nombre'] = args.nombre
+    return validar_configuracion(config)
+
+def configuraciones_aleatorias(cantidad, repeticiones, semilla):
+    """Configuraciones aleatorias como en el menú de experimentos aleatorios."""
+    from utils.helpers import generar_configuracion_aleatoria
+
+    configuraciones = []
+    for i in range(cantidad):
+        config = generar_configuracion_aleatoria(None if semilla is None else semilla + i)
+        config['repeticiones'] = repeticiones
+        config['semilla_base'] = semilla
+        configuraciones.append(validar_configuracion(config))
+    return configuraciones
+
+def ejecutar_configuraciones(configuraciones, args):
+    """Ejecuta, reporta y opcionalmente exporta y grafica un conjunto de configuraciones."""
+    from experiments.experimenter import Experimentador
+
+    if args.cache:
+        configuraciones = [dict(config, cache_laberintos=args.cache) for config in configuraciones]
+    if args.resoluble:
+        configuraciones = [dict(config, regenerar_hasta_resoluble=True) for config in configuraciones]
+    if args.instrumentar or args.exportar_metricas:
+        configuraciones = [dict(config, instrumentar=True) for config in configuraciones]
+    if args.pico_memoria:
+        configuraciones = [dict(config, instrumentar_memoria=True) for config in configuraciones]
+    if args.agentes:
+        configuraciones = [dict(config, agentes=args.agentes) for config in configuraciones]
+
+    registro = None
+    if args.registro:
+        from experiments.sink import RegistroResultados
+        registro = RegistroResultados(args.registro, guardar_caminos=args.guardar_caminos)
+
+    experimentador = Experimentador(registro=registro, conservar_resultados=registro is None)
+    salida = io.StringIO() if args.silencioso else sys.stdout
+    try:
+        with contextlib.redirect_stdout(salida):
+            experimentador.ejecutar_experimentos(configuraciones, procesos=args.procesos,
+                                                 tiempo_limite=args.tiempo_limite)
+    finally:
+        if registro is not None:
+            registro.cerrar()
+
+    if registro is not None:
+        # El reporte cubre todo el registro, incluidas las repeticiones de ejecuciones anteriores
+        from experiments.sink import cargar_resultados, contar_agotados
+        experimentador.resultados = cargar_resultados(args.registro)
+        agotadas = contar_agotados(args.registro)
+    else:
+        agotadas = experimentador.agotadas
+
+    resumen = experimentador.resumen()
+    experimentador.generar_reporte(resumen)
+    if agotadas:
+        print(f"\n{agotadas} tareas agotaron el tiempo límite y no se incluyen en el reporte")
+
+    if args.exportar:
+        experimentador.exportar_resultados(args.exportar, resumen)
+
+    if args.exportar_metricas:
+        from utils.metrics import exportar_metricas
+        exportar_metricas(experimentador.resultados, args.exportar_metricas)
+
+    if args.graficar:
+        from visualization.plotter import Plotter
+        if args.registro:
+            Plotter.graficar_registro(args.registro, args.graficar, procesos=args.procesos)
+        else:
+            Plotter.graficar_resultados(experimentador.resultados, resumen, mostrar=False)
+
+    return 0
+
+def comando_run(args):
+    return ejecutar_configuraciones([configuracion_desde_argumentos(args)], args)
+
+def comando_sweep(args):
+    if args.config:
+        configuraciones = cargar_configuraciones(args.config)
+    elif args.aleatorias:
+        configuraciones = configuraciones_aleatorias(args.aleatorias, args.repeticiones, args.semilla)
+    else:
+        from experiments.configuraciones import CONFIGURACIONES_PREDEFINIDAS
+        configuraciones = [dict(config, semilla_base=args.semilla) for config in CONFIGURACIONES_PREDEFINIDAS]
+    return ejecutar_configuraciones(configuraciones, args)
+
+def comando_bench(args):
+    """Ejecuta la suite de benchmarks (ver benchmarks/suite.py)."""
+    from benchmarks.suite import comando
+    return comando(args)
+
+def comando_plot(args):
+    """Dibuja las figuras de un registro, regenerando solo las que cambiaron."""
+    from visualization.plotter import Plotter
+    dibujadas = Plotter.graficar_registro(args.registro, args.directorio, procesos=args.procesos, dpi=args.dpi)
+    for ruta in dibujadas:
+        print(ruta)
+    print(f"{len(dibujadas)} figuras dibujadas en {args.directorio}")
+    return 0
+
+def agregar_opciones_ejecucion(parser):
+    parser.add_argument('--procesos', type=int, default=1, help="procesos en paralelo (por defecto 1)")
+    parser.add_argument('--tiempo-limite', type=float, default=None, help="segundos máximos por tarea")
+    parser.add_argument('--exportar', metavar='CSV', help="exportar el resumen a un archivo CSV")
+    parser.add_argument('--agentes', nargs='+', metavar='AGENTE',
+                        help="agentes a comparar: busqueda, genetico, dstar (por defecto busqueda y genetico)")
+    parser.add_argument('--graficar', nargs='?', const='graficos', default=None, metavar='DIRECTORIO',
+                        help="guardar los gráficos comparativos (con --registro, en DIRECTORIO; "
+                             "por defecto 'graficos')")
+    parser.add_argument('--silencioso', action='store_true', help="ocultar el progreso de los agentes")
+    parser.add_argument('--registro', metavar='JSONL',
+                        help="registrar cada repetición al terminar y retomar las ya registradas")
+    parser.add_argument('--cache', metavar='DIRECTORIO', help="caché en disco de laberintos generados")
+    parser.add_argument('--resoluble', action='store_true',
+                        help="regenerar los laberintos cuya salida real no es alcanzable")
+    parser.add_argument('--guardar-caminos', action='store_true', help="incluir los caminos comprimidos en el registro")
+    parser.add_argument('--instrumentar', action='store_true',
+                        help="medir el tiempo de cada fase y contar eventos de los agentes")
+    parser.add_argument('--pico-memoria', action='store_true', help="medir el pico de memoria con tracemalloc")
+    parser.add_argument('--exportar-metricas', metavar='CSV', help="exportar las métricas de instrumentación a CSV")
+
+def agregar_opciones_bench(parser):
+    """
+    Opciones de la suite de benchmarks. Se declaran aquí para no importar
+    benchmarks.suite (y con él numpy, scipy y los agentes) al armar el
+    parser; las omitidas las completa benchmarks.suite.comando.
+    """
+    parser.add_argument('--casos', nargs='+', metavar='CASO',
+                        help="generacion, mover_muros, a_estrella, fitness, fitness_poblacion, genetico, "
+                             "dstar (por defecto todos menos dstar)")
+    parser.add_argument('--tamanos', type=int, nargs='+', help="por defecto 15 50 200 1000")
+    parser.add_argument('--densidades', type=float, nargs='+', help="por defecto 0.1 0.2 0.3 0.4 0.5")
+    parser.add_argument('--semilla', type=int, default=None, help="por defecto 42")
+    parser.add_argument('--representacion', choices=('lista', 'numpy', 'bits'), default='numpy')
+    parser.add_argument('--repeticiones', type=int, default=5, help="mediciones por caso (por defecto 5)")
+    parser.add_argument('--guardar', metavar='JSON', help="guardar los resultados como línea base")
+    parser.add_argument('--comparar', metavar='JSON', help="comparar con una línea base guardada")
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help="aumento de tiempo admitido al comparar (por defecto 0.2 = 20%%)")
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='main.py', description="Escape del laberinto mutante (modo por lotes)")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    run = subparsers.add_parser('run', help="ejecuta un experimento definido por opciones")
+    run.add_argument('--nombre')
+    run.add_argument('--tamano', type=int, default=15)
+    run.add_argument('--densidad', type=float, default=0.2)
+    run.add_argument('--salidas', type=int, default=3)
+    run.add_argument('--prob-mover', type=float, default=0.1)
+    run.add_argument('--poblacion', type=int, default=100)
+    run.add_argument('--cromosoma', type=int, default=None, help="por defecto tamaño * 3")
+    run.add_argument('--generaciones', type=int, default=100)
+    run.add_argument('--repeticiones', type=int, default=3)
+    run.add_argument('--semilla', type=int, default=None)
+    run.add_argument('--representacion', choices=('lista', 'numpy', 'bits'), default='lista')
+    agregar_opciones_ejecucion(run)
+    run.set_defaults(funcion=comando_run)
+
+    sweep = subparsers.add_parser('sweep', help="ejecuta un conjunto de configuraciones")
+    origen = sweep.add_mutually_exclusive_group()
+    origen.add_argument('--config', metavar='ARCHIVO', help="configuraciones en JSON o TOML")
+    origen.add_argument('--aleatorias', type=int, metavar='N', help="generar N configuraciones aleatorias")
+    sweep.add_argument('--repeticiones', type=int, default=3, help="repeticiones de las configuraciones aleatorias")
+    sweep.add_argument('--semilla', type=int, default=None)
+    agregar_opciones_ejecucion(sweep)
+    sweep.set_defaults(funcion=comando_sweep)
+
+    bench = subparsers.add_parser('bench', help="mide los tiempos de las rutas críticas")
+    agregar_opciones_bench(bench)
+    bench.set_defaults(funcion=comando_bench)
+
+    plot = subparsers.add_parser('plot', help="dibuja las figuras de un registro sin pantalla")
+    plot.add_argument('registro', metavar='JSONL', help="registro escrito con --registro")
+    plot.add_argument('--directorio', default='graficos', help="directorio de las figuras (por defecto 'graficos')")
+    plot.add_argument('--procesos', type=int, default=None, help="procesos para dibujar (por defecto, uno por CPU)")
+    plot.add_argument('--dpi', type=int, default=150, help="resolución de las figuras por configuración")
+    plot.set_defaults(funcion=comando_plot)
+
+    return parser
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos; devuelve el código de salida."""
+    args = crear_parser().parse_args(argv)
+    try:
+        return args.funcion(args)
+    except (ValueError, OSError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
@@ -0,0 +1,135 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from .maze import Maze, VERSION_GENERADOR
+
+class CacheLaberintos:
+    """
+    Caché en disco de laberintos generados, direccionado por contenido.
+
+    La clave es un hash de los parámetros de generación (tamaño, densidad,
+    cantidad de salidas, probabilidad de mover muros, semilla y
+    representación) junto con VERSION_GENERADOR. Cada entrada guarda la
+    grilla como .npy (uint8, empaquetada en la representación 'bits') y las
+    salidas más el estado del generador aleatorio en un .json, de modo que un
+    laberinto leído del caché se comporta igual que uno recién generado,
+    incluso al mover muros.
+
+    Las grillas numpy se abren mapeadas en memoria y de solo lectura, por lo
+    que varios procesos comparten las mismas páginas. El tamaño total se
+    limita a `max_bytes` eliminando las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, directorio, max_bytes=1 << 30):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        os.makedirs(directorio, exist_ok=True)
+
+    @staticmethod
+    def clave(tamaño, densidad_muros, cantidad_salidas, probabilidad_mover_muro, semilla, representacion):
+        """Hash de los parámetros que determinan la grilla y las salidas generadas."""
+        parametros = {
+            'tamaño': tamaño,
+            'densidad_muros': densidad_muros,
+            'cantidad_salidas': cantidad_salidas,
+            'probabilidad_mover_muro': probabilidad_mover_muro,
+            'semilla': semilla,
+            'representacion': representacion,
+            'version': VERSION_GENERADOR
+        }
+        texto = json.dumps(parametros, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def _rutas(self, clave):
+        base = os.path.join(self.directorio, clave)
+        return base + '.npy', base + '.json'
+
+    def obtener(self, tamaño, densidad_muros=0.2, cantidad_salidas=3, probabilidad_mover_muro=0.1,
+                semilla=None, representacion='lista', modo_muros=None):
+        """Devuelve el laberinto pedido, leyéndolo del caché o generándolo y guardándolo."""
+        if semilla is None:
+            # Sin semilla el laberinto no es reproducible: no tiene sentido guardarlo
+            return Maze(tamaño, densidad_muros, cantidad_salidas, probabilidad_mover_muro,
+                        semilla, representacion, modo_muros)
+
+        clave = self.clave(tamaño, densidad_muros, cantidad_salidas, probabilidad_mover_muro,
+                           semilla, representacion)
+        ruta_grilla, ruta_datos = self._rutas(clave)
+
+        try:
+            with open(ruta_datos, encoding='utf-8') as f:
+                datos = json.load(f)
+            grilla = np.load(ruta_grilla, mmap_mode='r')
+        except (OSError, ValueError):
+            laberinto = Maze(tamaño, densidad_muros, cantidad_salidas, probabilidad_mover_muro,
+                             semilla, representacion, modo_muros)
+            self._guardar(clave, laberinto)
+            return laberinto
+
+        for ruta in (ruta_grilla, ruta_datos):
+            os.utime(ruta)
+
+        laberinto = Maze.desde_grilla(grilla, datos['salidas'], datos['salida_real'],
+                                      densidad_muros, probabilidad_mover_muro, semilla,
+                                      representacion, modo_muros)
+        if representacion != 'lista':
+            laberinto.rng.bit_generator.state = datos['estado_aleatorio']
+        else:
+            version, estado, gauss = datos['estado_aleatorio']
+            laberinto.rng.setstate((version, tuple(estado), gauss))
+        return laberinto
+
+    def _guardar(self, clave, laberinto):
+        """Escribe la entrada de forma atómica (archivo temporal + reemplazo) y aplica el límite."""
+        ruta_grilla, ruta_datos = self._rutas(clave)
+
+        if laberinto.representacion != 'lista':
+            estado_aleatorio = laberinto.rng.bit_generator.state
+        else:
+            estado_aleatorio = laberinto.rng.getstate()
+        datos = {
+            'salidas': [list(salida) for salida in laberinto.salidas],
+            'salida_real': list(laberinto.salida_real),
+            'estado_aleatorio': estado_aleatorio,
+            'version': VERSION_GENERADOR
+        }
+
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as f:
+            np.save(f, np.asarray(laberinto.grilla, dtype=np.uint8))
+        os.replace(temporal, ruta_grilla)
+
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(datos, f)
+        os.replace(temporal, ruta_datos)
+
+        self._aplicar_limite()
+
+    def _aplicar_limite(self):
+        """Elimina las entradas menos usadas recientemente hasta respetar max_bytes."""
+        entradas = {}
+        for nombre in os.listdir(self.directorio):
+            clave, extension = os.path.splitext(nombre)
+            if extension not in ('.npy', '.json'):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            tamaño, ultimo_uso = entradas.get(clave, (0, 0))
+            entradas[clave] = (tamaño + estado.st_size, max(ultimo_uso, estado.st_mtime))
+
+        total = sum(tamaño for tamaño, _ in entradas.values())
+        for clave, (tamaño, _) in sorted(entradas.items(), key=lambda entrada: entrada[1][1]):
+            if total <= self.max_bytes:
+                break
+            for ruta in self._rutas(clave):
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+            total -= tamaño
@@ -1,4 +1,5 @@
 """Definición de constantes y entidades del sistema."""
+from array import array
 
 # Estados de las celdas del laberinto
 LIBRE = 0
@@ -11,14 +12,80 @@ INICIO = 9
 MOVIMIENTOS = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # derecha, abajo, izquierda, arriba
 
 class ResultadoBusqueda:
-    """Contenedor para resultados de búsqueda."""
+    """
+    Contenedor para resultados de búsqueda.
+
+    El camino se guarda empaquetado (celda inicial y 2 bits por movimiento,
+    ver empaquetar_camino) y `camino` lo decodifica a una lista de tuplas
+    solo cuando se lee. Un camino con celdas no adyacentes se guarda como un
+    arreglo int32 plano de filas y columnas intercaladas.
+    """
+    __slots__ = ('exito', 'longitud_camino', 'nodos_expandidos', 'tiempo_ejecucion', 'fitness_final',
+                 'generaciones', 'aciertos_memo', 'fallos_memo', 'metricas', '_camino')
     
     def __init__(self, exito=False, longitud_camino=0, nodos_expandidos=0, 
-                 tiempo_ejecucion=0.0, camino=None, fitness_final=0, generaciones=0):
+                 tiempo_ejecucion=0.0, camino=None, fitness_final=0, generaciones=0,
+                 aciertos_memo=0, fallos_memo=0, metricas=None):
         self.exito = exito
         self.longitud_camino = longitud_camino
         self.nodos_expandidos = nodos_expandidos
         self.tiempo_ejecucion = tiempo_ejecucion
         self.camino = camino or []
         self.fitness_final = fitness_final
-        self.generaciones = generaciones
\ No newline at end of file
+        self.generaciones = generaciones
+        self.aciertos_memo = aciertos_memo
+        self.fallos_memo = fallos_memo
+        # Tiempos por fase, contadores y pico de memoria (solo con instrumentación)
+        self.metricas = metricas
+    
+    @property
+    def camino(self):
+        if isinstance(self._camino, array):
+            return list(zip(self._camino[0::2], self._camino[1::2]))
+        return desempaquetar_camino(*self._camino)
+    
+    @camino.setter
+    def camino(self, camino):
+        try:
+            self._camino = empaquetar_camino(camino)
+        except ValueError:
+            self._camino = array('i', [coordenada for posicion in camino for coordenada in posicion])
+    
+    def camino_empaquetado(self):
+        """(inicio, cantidad_movimientos, datos) como empaquetar_camino, sin decodificar el camino."""
+        if isinstance(self._camino, array):
+            raise ValueError("El camino contiene celdas no adyacentes")
+        return self._camino
+
+def empaquetar_camino(camino):
+    """
+    Codifica un camino de celdas adyacentes con 2 bits por movimiento.
+
+    Devuelve (inicio, cantidad_movimientos, datos), donde cada movimiento es
+    su índice en MOVIMIENTOS y cada byte de `datos` guarda cuatro movimientos.
+    """
+    if not camino:
+        return None, 0, b''
+
+    indices = {movimiento: i for i, movimiento in enumerate(MOVIMIENTOS)}
+    datos = bytearray((len(camino) + 2) // 4)
+    for i, (anterior, siguiente) in enumerate(zip(camino, camino[1:])):
+        movimiento = indices.get((siguiente[0] - anterior[0], siguiente[1] - anterior[1]))
+        if movimiento is None:
+            raise ValueError("El camino contiene celdas no adyacentes")
+        datos[i >> 2] |= movimiento << (2 * (i & 3))
+    return tuple(camino[0]), len(camino) - 1, bytes(datos)
+
+
+def desempaquetar_camino(inicio, cantidad_movimientos, datos):
+    """Reconstruye la lista de posiciones codificada por empaquetar_camino."""
+    if inicio is None:
+        return []
+
+    fila, columna = inicio
+    camino = [(fila, columna)]
+    for i in range(cantidad_movimientos):
+        df, dc = MOVIMIENTOS[(datos[i >> 2] >> (2 * (i & 3))) & 3]
+        fila, columna = fila + df, columna + dc
+        camino.append((fila, columna))
+    return camino
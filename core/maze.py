@@ -1,32 +1,132 @@
 import random
+import numpy as np
+from scipy import ndimage
 from .entities import LIBRE, MURO, SALIDA_REAL, SALIDA_FALSA, INICIO
 
+# Representaciones disponibles para la grilla:
+#   'lista': lista de listas de enteros (generación con random.Random)
+#   'numpy': ndarray uint8 contiguo (generación vectorizada con numpy.random.Generator)
+#   'bits': mapa de muros empaquetado a un bit por celda (np.packbits por fila),
+#           para laberintos muy grandes; genera la misma grilla que 'numpy'.
+#           Solo la grilla es compacta: mapa_libre y las búsquedas de
+#           SearchAgent siguen usando memoria proporcional a tamaño²
+#           (unos 11 bytes por celda en el pico de A*, más de 1 GB en 10000x10000)
+REPRESENTACIONES = ('lista', 'numpy', 'bits')
+
+# Tamaño máximo del laberinto según la representación
+TAMAÑO_MAXIMO = 1000
+TAMAÑO_MAXIMO_BITS = 20000
+
+# Celdas que se generan o recorren por bloque en la representación 'bits'
+CELDAS_POR_BLOQUE = 1 << 22
+
+# Modos de mover_muros para las representaciones numpy y bits:
+#   'vectorizado': todos los muros se mueven a la vez sobre el estado actual
+#   'secuencial': reproduce el recorrido celda a celda del algoritmo original
+MODOS_MUROS = ('vectorizado', 'secuencial')
+
+# Versión del generador de grillas y salidas. Debe incrementarse cada vez que
+# cambie lo que se genera para una misma semilla (invalida los cachés en disco).
+VERSION_GENERADOR = 1
+
 class Maze:
     """
     Clase que representa un laberinto N x N con paredes móviles y múltiples salidas.
     """
     
     def __init__(self, tamaño, densidad_muros=0.2, cantidad_salidas=3, 
-                 probabilidad_mover_muro=0.1, semilla=None):
+                 probabilidad_mover_muro=0.1, semilla=None, representacion='lista',
+                 modo_muros=None):
+        self._configurar(tamaño, densidad_muros, cantidad_salidas, probabilidad_mover_muro,
+                         semilla, representacion, modo_muros)
+
+        # Cada laberinto tiene su propio generador: random.Random con 'lista',
+        # numpy.random.Generator con las demás representaciones
+        if representacion != 'lista':
+            self.rng = np.random.default_rng(semilla)
+        else:
+            self.rng = random.Random(semilla)
+
+        self._asignar_grilla(self._generar_grilla())
+        self.inicio = (0, 0)
+        self.salidas = self._generar_salidas()
+
+    @classmethod
+    def desde_grilla(cls, grilla, salidas, salida_real, densidad_muros=0.2,
+                     probabilidad_mover_muro=0.1, semilla=None, representacion='lista',
+                     modo_muros=None):
+        """
+        Crea un laberinto a partir de una grilla y salidas ya generadas.
+
+        Con la representación numpy la grilla se usa tal cual (puede ser un
+        arreglo de solo lectura, como un .npy mapeado en memoria); se copia
+        recién la primera vez que se mueven los muros. Con 'bits' se acepta la
+        grilla ya empaquetada (tamaño x bytes por fila) o una grilla completa,
+        que se empaqueta.
+        """
+        laberinto = cls.__new__(cls)
+        laberinto._configurar(len(grilla), densidad_muros, len(salidas), probabilidad_mover_muro,
+                              semilla, representacion, modo_muros)
+
+        if representacion == 'numpy':
+            laberinto.rng = np.random.default_rng(semilla)
+            laberinto._asignar_grilla(grilla)
+        elif representacion == 'bits':
+            laberinto.rng = np.random.default_rng(semilla)
+            if len(grilla[0]) != laberinto._bytes_fila:
+                grilla = np.packbits(np.asarray(grilla) == MURO, axis=1)
+            laberinto._asignar_grilla(grilla)
+        else:
+            laberinto.rng = random.Random(semilla)
+            laberinto._asignar_grilla([[int(celda) for celda in fila] for fila in grilla])
+
+        laberinto.inicio = (0, 0)
+        laberinto.salidas = [tuple(salida) for salida in salidas]
+        laberinto.salida_real = tuple(salida_real)
+        return laberinto
+
+    def _configurar(self, tamaño, densidad_muros, cantidad_salidas, probabilidad_mover_muro,
+                    semilla, representacion, modo_muros):
+        """Guarda y valida los parámetros del laberinto."""
         self.tamaño = tamaño
         self.densidad_muros = densidad_muros
         self.cantidad_salidas = cantidad_salidas
         self.probabilidad_mover_muro = probabilidad_mover_muro
         self.semilla = semilla
+        self.representacion = representacion
+        if modo_muros is None:
+            modo_muros = 'secuencial' if representacion == 'lista' else 'vectorizado'
+        self.modo_muros = modo_muros
+        self._bytes_fila = (tamaño + 7) // 8
 
         self._validar_parametros()
 
-        if semilla is not None:
-            random.seed(semilla)
+    def _asignar_grilla(self, grilla):
+        """Reemplaza la grilla y descarta las estructuras derivadas de la anterior."""
+        self.grilla = grilla
+        self._celdas = self._vista_plana()
+        self._indices_muros = None
+        self._componentes = None
+        self._distancias = None
 
-        self.grilla = self._generar_grilla()
-        self.inicio = (0, 0)
-        self.salidas = self._generar_salidas()
+    def __getstate__(self):
+        # La vista plana es un memoryview (no serializable): se reconstruye al cargar.
+        # Las componentes y el campo de distancias se recalculan si hacen falta.
+        estado = self.__dict__.copy()
+        estado['_celdas'] = None
+        estado['_componentes'] = None
+        estado['_distancias'] = None
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._celdas = self._vista_plana()
 
     def _validar_parametros(self):
         """Valida que los parámetros del laberinto sean correctos."""
-        if self.tamaño < 10 or self.tamaño > 1000:
-            raise ValueError("El tamaño debe estar entre 10 y 1000")
+        tamaño_maximo = TAMAÑO_MAXIMO_BITS if self.representacion == 'bits' else TAMAÑO_MAXIMO
+        if self.tamaño < 10 or self.tamaño > tamaño_maximo:
+            raise ValueError(f"El tamaño debe estar entre 10 y {tamaño_maximo}")
         
         if self.cantidad_salidas < 2 or self.cantidad_salidas > 100:
             raise ValueError("La cantidad de salidas debe estar entre 2 y 100")
@@ -41,8 +141,35 @@ class Maze:
         if not 0 <= self.probabilidad_mover_muro <= 1:
             raise ValueError("La probabilidad de mover muro debe estar entre 0 y 1")
 
+        if self.representacion not in REPRESENTACIONES:
+            raise ValueError(f"La representación debe ser una de {REPRESENTACIONES}")
+
+        if self.modo_muros not in MODOS_MUROS:
+            raise ValueError(f"El modo de mover muros debe ser uno de {MODOS_MUROS}")
+
+        if self.representacion == 'lista' and self.modo_muros != 'secuencial':
+            raise ValueError("La representación 'lista' solo admite el modo 'secuencial'")
+
     def _generar_grilla(self):
         """Genera el laberinto inicial con muros aleatorios."""
+        if self.representacion == 'numpy':
+            muros = self.rng.random((self.tamaño, self.tamaño)) < self.densidad_muros
+            grilla = np.where(muros, MURO, LIBRE).astype(np.uint8)
+            grilla[0, 0] = LIBRE
+            return grilla
+
+        if self.representacion == 'bits':
+            # Por bloques de filas, para no materializar la grilla completa; el
+            # flujo aleatorio es el mismo que con 'numpy'
+            grilla = np.empty((self.tamaño, self._bytes_fila), dtype=np.uint8)
+            filas_bloque = max(1, CELDAS_POR_BLOQUE // self.tamaño)
+            for inicio in range(0, self.tamaño, filas_bloque):
+                fin = min(inicio + filas_bloque, self.tamaño)
+                muros = self.rng.random((fin - inicio, self.tamaño)) < self.densidad_muros
+                grilla[inicio:fin] = np.packbits(muros, axis=1)
+            grilla[0, 0] &= 0x7F
+            return grilla
+
         grilla = []
         for fila in range(self.tamaño):
             fila_actual = []
@@ -50,10 +177,19 @@ class Maze:
                 if (fila, columna) == (0, 0):
                     fila_actual.append(LIBRE)
                 else:
-                    fila_actual.append(MURO if random.random() < self.densidad_muros else LIBRE)
+                    fila_actual.append(MURO if self.rng.random() < self.densidad_muros else LIBRE)
             grilla.append(fila_actual)
         return grilla
 
+    def _vista_plana(self):
+        """
+        Vista plana de la grilla numpy (fila * tamaño + columna) o de los bytes
+        empaquetados (fila * bytes por fila + columna // 8), sin copiarla.
+        """
+        if self.representacion == 'lista':
+            return None
+        return memoryview(self.grilla).cast('B')
+
     def _generar_salidas(self):
         """Genera múltiples salidas, una real al azar."""
         posibles_salidas = [(fila, self.tamaño - 1) for fila in range(self.tamaño)] + \
@@ -61,21 +197,219 @@ class Maze:
         
         posibles_salidas = [pos for pos in posibles_salidas if pos != (0,0)]
         cantidad_salidas = min(self.cantidad_salidas, len(posibles_salidas))
+
+        if self.representacion != 'lista':
+            indices = self.rng.choice(len(posibles_salidas), cantidad_salidas, replace=False)
+            salidas_seleccionadas = [posibles_salidas[i] for i in indices]
+            self.salida_real = salidas_seleccionadas[self.rng.integers(cantidad_salidas)]
+            return salidas_seleccionadas
         
-        salidas_seleccionadas = random.sample(posibles_salidas, cantidad_salidas)
-        self.salida_real = random.choice(salidas_seleccionadas)
+        salidas_seleccionadas = self.rng.sample(posibles_salidas, cantidad_salidas)
+        self.salida_real = self.rng.choice(salidas_seleccionadas)
         return salidas_seleccionadas
 
     def mover_muros(self):
-        """Mueve algunos muros según la probabilidad definida."""
+        """
+        Mueve algunos muros según la probabilidad definida.
+
+        Devuelve la lista de posiciones cuyo contenido cambió (celdas que
+        dejaron de ser muro y celdas que pasaron a serlo), para que los agentes
+        puedan actualizar sus planes de forma incremental.
+        """
+        self._componentes = None
+        self._distancias = None
+        if self.representacion != 'lista' and not self.grilla.flags.writeable:
+            self._asignar_grilla(np.array(self.grilla))
+
+        if self.representacion == 'bits':
+            if self.modo_muros == 'vectorizado':
+                return self._mover_muros_bits_vectorizado()
+            return self._mover_muros_bits_secuencial()
+
+        if self.representacion == 'numpy':
+            if self.modo_muros == 'vectorizado':
+                return self._mover_muros_vectorizado()
+            return self._mover_muros_secuencial()
+
+        cambios = {}
         for fila in range(self.tamaño):
             for columna in range(self.tamaño):
-                if self.grilla[fila][columna] == MURO and random.random() < self.probabilidad_mover_muro:
-                    nueva_fila = random.randint(0, self.tamaño-1)
-                    nueva_columna = random.randint(0, self.tamaño-1)
+                if self.grilla[fila][columna] == MURO and self.rng.random() < self.probabilidad_mover_muro:
+                    nueva_fila = self.rng.randint(0, self.tamaño-1)
+                    nueva_columna = self.rng.randint(0, self.tamaño-1)
                     if self.grilla[nueva_fila][nueva_columna] == LIBRE:
                         self.grilla[nueva_fila][nueva_columna] = MURO
                         self.grilla[fila][columna] = LIBRE
+                        cambios[(nueva_fila, nueva_columna)] = None
+                        cambios[(fila, columna)] = None
+        return list(cambios)
+
+    def _posiciones(self, indices):
+        """Convierte índices planos (fila * tamaño + columna) en posiciones (fila, columna)."""
+        filas, columnas = np.divmod(indices, self.tamaño)
+        return list(zip(filas.tolist(), columnas.tolist()))
+
+    def _mover_muros_vectorizado(self):
+        """
+        Versión vectorizada de mover_muros para la representación numpy.
+
+        Cada muro se mueve con probabilidad `probabilidad_mover_muro`; en lugar
+        de sortear una máscara de Bernoulli sobre toda la grilla se sortea la
+        cantidad de muros que se mueven (binomial) y luego cuáles, lo que tiene
+        la misma distribución y cuesta O(muros movidos). Todos los destinos se
+        sortean de una vez sobre el estado actual de la grilla: un destino solo
+        es válido si está libre en ese estado y, si varios muros eligen el mismo
+        destino, gana el primero en orden de recorrido (fila, columna).
+        """
+        plana = self.grilla.reshape(-1)
+        if self._indices_muros is None:
+            self._indices_muros = np.flatnonzero(plana == MURO)
+        muros = self._indices_muros
+
+        cantidad = self.rng.binomial(muros.size, self.probabilidad_mover_muro)
+        if cantidad == 0:
+            return []
+
+        seleccion = self.rng.choice(muros.size, cantidad, replace=False)
+        seleccion = seleccion[np.argsort(muros[seleccion], kind='stable')]
+        origenes = muros[seleccion]
+        destinos = self.rng.integers(0, plana.size, size=cantidad)
+
+        validos = plana[destinos] == LIBRE
+        seleccion, origenes, destinos = seleccion[validos], origenes[validos], destinos[validos]
+
+        destinos, primeros = np.unique(destinos, return_index=True)
+        seleccion, origenes = seleccion[primeros], origenes[primeros]
+
+        plana[destinos] = MURO
+        plana[origenes] = LIBRE
+        muros[seleccion] = destinos
+        return self._posiciones(np.concatenate([origenes, destinos]))
+
+    def _mover_muros_secuencial(self):
+        """
+        Versión de mover_muros con la semántica exacta del recorrido original.
+
+        Se sortea de una vez un número y un destino por celda, pero los
+        movimientos se aplican en orden de recorrido sobre la grilla que va
+        cambiando: un muro movido hacia adelante puede volver a moverse y una
+        celda liberada antes puede recibir otro muro. Para una misma semilla el
+        resultado es siempre el mismo.
+        """
+        plana = self.grilla.reshape(-1)
+        celdas = self._celdas
+        candidatos = np.flatnonzero(self.rng.random(plana.size) < self.probabilidad_mover_muro)
+        destinos = self.rng.integers(0, plana.size, size=candidatos.size)
+
+        cambios = {}
+        for celda, destino in zip(candidatos.tolist(), destinos.tolist()):
+            if celdas[celda] == MURO and celdas[destino] == LIBRE:
+                celdas[destino] = MURO
+                celdas[celda] = LIBRE
+                cambios[destino] = None
+                cambios[celda] = None
+
+        self._indices_muros = None
+        return self._posiciones(np.fromiter(cambios, dtype=np.int64, count=len(cambios)))
+
+    def _muros_en(self, indices):
+        """Para la representación 'bits': 1 en los índices planos que son muro, 0 en los libres."""
+        filas, columnas = np.divmod(indices, self.tamaño)
+        bytes_celdas = self.grilla[filas, columnas >> 3]
+        return (bytes_celdas >> (7 - (columnas & 7)).astype(np.uint8)) & 1
+
+    def _sortear_celdas(self):
+        """
+        Índices planos de celdas elegidas cada una con probabilidad
+        `probabilidad_mover_muro`, en orden de recorrido.
+
+        Se generan como saltos geométricos entre celdas elegidas, lo que cuesta
+        O(celdas elegidas) en vez de un número aleatorio por celda.
+        """
+        total = self.tamaño * self.tamaño
+        probabilidad = self.probabilidad_mover_muro
+        if probabilidad == 0:
+            return np.empty(0, dtype=np.int64)
+
+        esperadas = total * probabilidad
+        cantidad_bloque = int(esperadas + 4 * esperadas ** 0.5) + 16
+        bloques = []
+        ultima = -1
+        while ultima < total:
+            posiciones = ultima + np.cumsum(self.rng.geometric(probabilidad, size=cantidad_bloque))
+            bloques.append(posiciones[posiciones < total])
+            ultima = posiciones[-1]
+        return np.concatenate(bloques)
+
+    def _mover_muros_bits_vectorizado(self):
+        """
+        mover_muros sobre el mapa de bits, con la semántica de
+        _mover_muros_vectorizado: destinos válidos si están libres en el estado
+        actual y, ante destinos repetidos, gana el primer muro en recorrido.
+
+        En lugar de mantener los índices de todos los muros (que en grillas de
+        10000 x 10000 ocuparían cientos de MB) se sortean las celdas con
+        probabilidad `probabilidad_mover_muro` y se descartan las libres.
+        """
+        candidatos = self._sortear_celdas()
+        origenes = candidatos[self._muros_en(candidatos) == 1]
+        if origenes.size == 0:
+            return []
+
+        destinos = self.rng.integers(0, self.tamaño * self.tamaño, size=origenes.size)
+        validos = self._muros_en(destinos) == 0
+        origenes, destinos = origenes[validos], destinos[validos]
+
+        destinos, primeros = np.unique(destinos, return_index=True)
+        origenes = origenes[primeros]
+
+        plana = self.grilla.reshape(-1)
+        for indices, activar in ((destinos, True), (origenes, False)):
+            filas, columnas = np.divmod(indices, self.tamaño)
+            bytes_indices = filas * self._bytes_fila + (columnas >> 3)
+            mascaras = (0x80 >> (columnas & 7)).astype(np.uint8)
+            if activar:
+                np.bitwise_or.at(plana, bytes_indices, mascaras)
+            else:
+                np.bitwise_and.at(plana, bytes_indices, ~mascaras)
+        return self._posiciones(np.concatenate([origenes, destinos]))
+
+    def _mover_muros_bits_secuencial(self):
+        """
+        mover_muros sobre el mapa de bits con la semántica exacta del
+        recorrido original. Consume los mismos números aleatorios que
+        _mover_muros_secuencial, por lo que para una misma semilla ambas
+        representaciones evolucionan igual.
+        """
+        tamaño = self.tamaño
+        bytes_fila = self._bytes_fila
+        celdas = self._celdas
+
+        filas_bloque = max(1, CELDAS_POR_BLOQUE // tamaño)
+        bloques = []
+        for inicio in range(0, tamaño, filas_bloque):
+            fin = min(inicio + filas_bloque, tamaño)
+            sorteo = self.rng.random((fin - inicio) * tamaño) < self.probabilidad_mover_muro
+            bloques.append(np.flatnonzero(sorteo) + inicio * tamaño)
+        candidatos = np.concatenate(bloques)
+        destinos = self.rng.integers(0, tamaño * tamaño, size=candidatos.size)
+
+        cambios = {}
+        for celda, destino in zip(candidatos.tolist(), destinos.tolist()):
+            fila, columna = divmod(celda, tamaño)
+            byte_celda, mascara_celda = fila * bytes_fila + (columna >> 3), 0x80 >> (columna & 7)
+            if not celdas[byte_celda] & mascara_celda:
+                continue
+            fila, columna = divmod(destino, tamaño)
+            byte_destino, mascara_destino = fila * bytes_fila + (columna >> 3), 0x80 >> (columna & 7)
+            if celdas[byte_destino] & mascara_destino:
+                continue
+            celdas[byte_destino] |= mascara_destino
+            celdas[byte_celda] &= ~mascara_celda & 0xFF
+            cambios[destino] = None
+            cambios[celda] = None
+
+        return self._posiciones(np.fromiter(cambios, dtype=np.int64, count=len(cambios)))
 
     def es_valida(self, posicion):
         """Verifica si una posición está dentro del laberinto."""
@@ -85,7 +419,13 @@ class Maze:
     def es_libre(self, posicion):
         """Verifica si una posición está libre (no es muro)."""
         fila, columna = posicion
-        return self.es_valida(posicion) and self.grilla[fila][columna] != MURO
+        if not self.es_valida(posicion):
+            return False
+        if self.representacion == 'bits':
+            return not self._celdas[fila * self._bytes_fila + (columna >> 3)] & (0x80 >> (columna & 7))
+        if self._celdas is not None:
+            return self._celdas[fila * self.tamaño + columna] != MURO
+        return self.grilla[fila][columna] != MURO
 
     def es_salida(self, posicion):
         """Verifica si una posición es una salida."""
@@ -95,6 +435,75 @@ class Maze:
         """Verifica si una posición es la salida real."""
         return posicion == self.salida_real
 
+    def componentes(self):
+        """
+        Etiqueta de componente conexa (4-vecindad) de cada celda libre, como
+        arreglo tamaño x tamaño; los muros tienen etiqueta 0.
+
+        Se calcula con scipy.ndimage.label la primera vez que se consulta y se
+        reutiliza hasta que se mueven los muros.
+        """
+        if self._componentes is None:
+            libres = np.frombuffer(self.mapa_libre(), dtype=np.bool_).reshape(self.tamaño, self.tamaño)
+            self._componentes, _ = ndimage.label(libres)
+        return self._componentes
+
+    def alcanzable(self, origen, destino):
+        """Indica si hay un camino de celdas libres entre `origen` y `destino` en el estado actual."""
+        if not (self.es_libre(origen) and self.es_libre(destino)):
+            return False
+        componentes = self.componentes()
+        return bool(componentes[origen] == componentes[destino])
+
+    def es_resoluble(self):
+        """Indica si la salida real es alcanzable desde el inicio."""
+        return self.alcanzable(self.inicio, self.salida_real)
+
+    def campo_distancias(self):
+        """
+        Distancia en pasos de cada celda a la salida real por celdas libres,
+        como arreglo int32 tamaño x tamaño; -1 en muros y en celdas sin camino
+        a la salida.
+
+        Se calcula con un BFS inverso desde la salida real que avanza por
+        frentes (todas las celdas a una misma distancia a la vez) y se
+        reutiliza hasta que se mueven los muros.
+        """
+        if self._distancias is None:
+            tamaño = self.tamaño
+            total = tamaño * tamaño
+            pendientes = np.frombuffer(self.mapa_libre(), dtype=np.bool_).copy()
+            distancias = np.full(total, -1, dtype=np.int32)
+
+            fila, columna = self.salida_real
+            frente = np.array([fila * tamaño + columna], dtype=np.int64)
+            frente = frente[pendientes[frente]]
+            distancia = 0
+            while frente.size:
+                distancias[frente] = distancia
+                pendientes[frente] = False
+                columnas = frente % tamaño
+                vecinos = np.concatenate([frente[columnas < tamaño - 1] + 1, frente[columnas > 0] - 1,
+                                          frente + tamaño, frente - tamaño])
+                vecinos = vecinos[(vecinos >= 0) & (vecinos < total)]
+                frente = np.unique(vecinos[pendientes[vecinos]])
+                distancia += 1
+
+            self._distancias = distancias.reshape(tamaño, tamaño)
+        return self._distancias
+
+    def mapa_libre(self):
+        """
+        Devuelve la grilla aplanada (fila * tamaño + columna) con 1 en las
+        celdas libres. Ocupa un byte por celda también con 'bits'.
+        """
+        if self.representacion == 'numpy':
+            return (self.grilla != MURO).tobytes()
+        if self.representacion == 'bits':
+            muros = np.unpackbits(self.grilla, axis=1, count=self.tamaño)
+            return np.logical_not(muros, out=muros.view(np.bool_)).tobytes()
+        return bytes(celda != MURO for fila in self.grilla for celda in fila)
+
     def obtener_vecinos(self, posicion):
         """Obtiene las posiciones vecinas válidas y libres."""
         from .entities import MOVIMIENTOS
@@ -119,7 +528,12 @@ class Maze:
             print(f"Total de salidas: {len(self.salidas)}")
             return
 
-        grilla_copia = [fila.copy() for fila in self.grilla]
+        if self.representacion == 'numpy':
+            grilla_copia = self.grilla.tolist()
+        elif self.representacion == 'bits':
+            grilla_copia = np.unpackbits(self.grilla, axis=1, count=self.tamaño).tolist()
+        else:
+            grilla_copia = [fila.copy() for fila in self.grilla]
         for fila_salida, columna_salida in self.salidas:
             valor = SALIDA_FALSA if (fila_salida, columna_salida) != self.salida_real else SALIDA_REAL
             grilla_copia[fila_salida][columna_salida] = valor
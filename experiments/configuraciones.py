@@ -0,0 +1,41 @@
+"""
+Configuraciones predefinidas de experimentos, compartidas por el menú de
+main.py y el subcomando sweep de la línea de comandos.
+"""
+import math
+
+CONFIGURACIONES_PREDEFINIDAS = [
+    {
+        'nombre': 'Pequeño_BajaDensidad',
+        'tamaño': 15,
+        'densidad_muros': 0.1,
+        'cantidad_salidas': math.ceil(15/10) + 2,  # 2 + 2 = 4
+        'prob_mover_muro': 0.05,
+        'tamaño_poblacion': 50,
+        'longitud_cromosoma': 45,
+        'max_generaciones': 50,
+        'repeticiones': 3
+    },
+    {
+        'nombre': 'Medio_MediaDensidad',
+        'tamaño': 30,
+        'densidad_muros': 0.2,
+        'cantidad_salidas': math.ceil(30/10) + 2,  # 3 + 2 = 5
+        'prob_mover_muro': 0.1,
+        'tamaño_poblacion': 100,
+        'longitud_cromosoma': 90,
+        'max_generaciones': 100,
+        'repeticiones': 3
+    },
+    {
+        'nombre': 'Grande_AltaDensidad',
+        'tamaño': 50,
+        'densidad_muros': 0.3,
+        'cantidad_salidas': math.ceil(50/10) + 2,  # 5 + 2 = 7
+        'prob_mover_muro': 0.15,
+        'tamaño_poblacion': 150,
+        'longitud_cromosoma': 150,
+        'max_generaciones': 150,
+        'repeticiones': 3
+    }
+]
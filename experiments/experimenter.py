@@ -1,92 +1,249 @@
-import time
+import copy
 import random
+import time
+import numpy as np
 from core.maze import Maze
+from core.cache import CacheLaberintos
 from agents.search_agent import SearchAgent
 from agents.genetic_agent import GeneticAgent
+from agents.dstar_agent import DStarLiteAgent
 from utils.metrics import exportar_resultados
+from utils.instrumentacion import crear_instrumentacion
+from utils.helpers import derivar_semilla, FLUJO_REGENERACION, FLUJO_GENETICO, FLUJO_DESEMPATE
+
+# Agentes que pueden compararse, en el orden en que se ejecutan en cada repetición:
+#   'busqueda': SearchAgent sobre el laberinto inicial
+#   'genetico': GeneticAgent sobre el laberinto inicial
+#   'dstar': DStarLiteAgent, que avanza mientras los muros se mueven
+AGENTES_DISPONIBLES = ('busqueda', 'genetico', 'dstar')
+
+# Agentes que se comparan si la configuración no indica 'agentes'
+AGENTES = ('busqueda', 'genetico')
+NOMBRES_AGENTES = {'busqueda': 'Búsqueda', 'genetico': 'Genético', 'dstar': 'D* Lite'}
+ETIQUETAS_REPORTE = {'busqueda': 'Búsqueda A*:  ', 'genetico': 'Algoritmo Genético:', 'dstar': 'D* Lite:      '}
+
+def agentes_configuracion(configuracion):
+    """Agentes de la configuración ('agentes', por defecto AGENTES) en el orden de AGENTES_DISPONIBLES."""
+    agentes = configuracion.get('agentes', AGENTES)
+    desconocidos = [agente for agente in agentes if agente not in AGENTES_DISPONIBLES]
+    if desconocidos:
+        raise ValueError(f"Agentes desconocidos: {', '.join(desconocidos)}. "
+                         f"Deben ser de {AGENTES_DISPONIBLES}")
+    return tuple(agente for agente in AGENTES_DISPONIBLES if agente in agentes)
+
+def semillas_repeticiones(configuracion):
+    """
+    Semilla de cada repetición: semilla_base + i, o una aleatoria si no hay
+    semilla base. Los generadores de cada repetición (laberinto, genético,
+    desempate) se derivan de esta semilla y no del estado global de random.
+    """
+    semilla_base = configuracion.get('semilla_base')
+    if semilla_base is not None:
+        return [semilla_base + i for i in range(configuracion['repeticiones'])]
+    aleatorio = random.Random()
+    return [aleatorio.randint(1, 10000) for _ in range(configuracion['repeticiones'])]
+
+# Intentos de generación con 'regenerar_hasta_resoluble' antes de aceptar un laberinto sin solución
+MAX_REGENERACIONES = 100
+
+def semilla_regeneracion(semilla, intento):
+    """Semilla del intento `intento` de generar el laberinto de una repetición."""
+    if intento == 0:
+        return semilla
+    return derivar_semilla(semilla, FLUJO_REGENERACION, intento)
+
+def generar_laberinto(configuracion, semilla):
+    """
+    Genera un laberinto con los parámetros de la configuración. Si la
+    configuración indica un directorio en 'cache_laberintos', se lee de (o se
+    guarda en) ese caché.
+    """
+    parametros = dict(
+        tamaño=configuracion['tamaño'],
+        densidad_muros=configuracion['densidad_muros'],
+        cantidad_salidas=configuracion['cantidad_salidas'],
+        probabilidad_mover_muro=configuracion['prob_mover_muro'],
+        semilla=semilla,
+        representacion=configuracion.get('representacion', 'lista'),
+        modo_muros=configuracion.get('modo_muros')
+    )
+    if configuracion.get('cache_laberintos'):
+        return CacheLaberintos(configuracion['cache_laberintos']).obtener(**parametros)
+    return Maze(**parametros)
+
+def crear_laberinto(configuracion, semilla):
+    """
+    Crea el laberinto de una repetición.
+
+    Con 'regenerar_hasta_resoluble' se descartan los laberintos cuya salida
+    real no es alcanzable desde el inicio y se genera otro con una semilla
+    derivada de la de la repetición (hasta MAX_REGENERACIONES intentos).
+    """
+    laberinto = generar_laberinto(configuracion, semilla)
+    if configuracion.get('regenerar_hasta_resoluble'):
+        intento = 1
+        while not laberinto.es_resoluble() and intento < MAX_REGENERACIONES:
+            laberinto = generar_laberinto(configuracion, semilla_regeneracion(semilla, intento))
+            intento += 1
+    return laberinto
+
+def crear_laberinto_medido(configuracion, semilla):
+    """crear_laberinto y el tiempo que tomó, en nanosegundos."""
+    inicio = time.perf_counter_ns()
+    laberinto = crear_laberinto(configuracion, semilla)
+    return laberinto, time.perf_counter_ns() - inicio
+
+def ejecutar_agente(agente, configuracion, laberinto, semilla, tiempo_laberinto_ns=0):
+    """
+    Ejecuta el agente indicado (uno de AGENTES_DISPONIBLES) sobre el
+    laberinto. D* Lite mueve los muros a cada paso, por lo que trabaja sobre
+    una copia y el laberinto de la repetición no cambia para los demás agentes.
+
+    Con 'instrumentar' (o 'instrumentar_memoria') en la configuración, el
+    resultado incluye las métricas de utils.instrumentacion, con la fase
+    'generacion_laberinto' igual a `tiempo_laberinto_ns`. Los aciertos y
+    fallos del memo de fitness del genético ('memo_fitness') se informan
+    siempre, en ResultadoBusqueda.aciertos_memo y fallos_memo.
+    """
+    instrumentacion = crear_instrumentacion(configuracion.get('instrumentar', False),
+                                            configuracion.get('instrumentar_memoria', False))
+    instrumentacion.sumar_tiempo('generacion_laberinto', tiempo_laberinto_ns)
+    if agente == 'busqueda':
+        agente_busqueda = SearchAgent(laberinto, modo=configuracion.get('modo_busqueda', 'salida_real'),
+                                      verificar_alcance=configuracion.get('verificar_alcance', True),
+                                      tipo_heuristica=configuracion.get('heuristica', 'manhattan'),
+                                      estrategia=configuracion.get('estrategia_busqueda', 'a_estrella'),
+                                      semilla=derivar_semilla(semilla, FLUJO_DESEMPATE)
+                                      if configuracion.get('desempate_aleatorio') else None,
+                                      instrumentacion=instrumentacion)
+        return agente_busqueda.ejecutar()
+    
+    if agente == 'dstar':
+        agente_dstar = DStarLiteAgent(copy.deepcopy(laberinto), max_pasos=configuracion.get('max_pasos_dstar'),
+                                      instrumentacion=instrumentacion)
+        return agente_dstar.ejecutar()
+    
+    agente_genetico = GeneticAgent(
+        laberinto,
+        tamaño_poblacion=configuracion['tamaño_poblacion'],
+        longitud_cromosoma=configuracion['longitud_cromosoma'],
+        max_generaciones=configuracion['max_generaciones'],
+        evaluacion=configuracion.get('evaluacion', 'vectorizada'),
+        reproduccion=configuracion.get('reproduccion', 'clasica'),
+        seleccion=configuracion.get('seleccion', 'ruleta'),
+        islas=configuracion.get('islas', 1),
+        semilla=derivar_semilla(semilla, FLUJO_GENETICO),
+        verificar_alcance=configuracion.get('verificar_alcance', True),
+        distancia=configuracion.get('distancia_fitness', 'manhattan'),
+        cache_prefijos=configuracion.get('cache_prefijos', 0),
+        memo_generaciones=configuracion.get('memo_fitness', 0),
+        instrumentacion=instrumentacion
+    )
+    return agente_genetico.ejecutar()
+
+def tiene_resultados(experimento):
+    """Indica si algún agente del experimento tiene repeticiones."""
+    return any(lista for agente, lista in experimento.items() if agente != 'configuracion')
 
 class Experimentador:
-    def __init__(self):
+    def __init__(self, registro=None, conservar_resultados=True):
+        """
+        `registro` (un RegistroResultados) recibe cada repetición apenas termina
+        y permite omitir las ya registradas. Con `conservar_resultados=False`
+        los resultados no se guardan en memoria (se leen luego del registro).
+        """
         self.resultados = []
+        self.registro = registro
+        self.conservar_resultados = conservar_resultados
+        # Tareas interrumpidas por tiempo límite en ejecutar_experimentos
+        self.agotadas = 0
     
     def ejecutar_experimento(self, configuracion):
         """Ejecuta un experimento con la configuración dada."""
         print(f"Ejecutando experimento: {configuracion['nombre']}")
         
-        resultados_experimento = {
-            'configuracion': configuracion,
-            'busqueda': [],
-            'genetico': []
-        }
+        agentes = agentes_configuracion(configuracion)
+        resultados_experimento = {'configuracion': configuracion}
+        for agente in agentes:
+            resultados_experimento[agente] = []
         
-        semilla_base = configuracion.get('semilla_base')
+        semillas = semillas_repeticiones(configuracion)
         
-        for i in range(configuracion['repeticiones']):
-            print(f"  Repetición {i+1}/{configuracion['repeticiones']}...")
+        for i, semilla_actual in enumerate(semillas):
+            pendientes = [agente for agente in agentes
+                          if self.registro is None or not self.registro.completado(configuracion, semilla_actual, agente)]
+            if not pendientes:
+                print(f"  Repetición {i+1}/{configuracion['repeticiones']} ya registrada, se omite")
+                continue
             
-            # Determinar semilla para esta repetición
-            if semilla_base is not None:
-                semilla_actual = semilla_base + i
-            else:
-                semilla_actual = random.randint(1, 10000)
-            
-            # Crear laberinto
-            laberinto = Maze(
-                tamaño=configuracion['tamaño'],
-                densidad_muros=configuracion['densidad_muros'],
-                cantidad_salidas=configuracion['cantidad_salidas'],
-                probabilidad_mover_muro=configuracion['prob_mover_muro'],
-                semilla=semilla_actual
-            )
+            print(f"  Repetición {i+1}/{configuracion['repeticiones']}...")
             
-            # Ejecutar algoritmo de búsqueda
-            agente_busqueda = SearchAgent(laberinto)
-            resultado_busqueda = agente_busqueda.ejecutar()
-            resultados_experimento['busqueda'].append(resultado_busqueda)
+            laberinto, tiempo_laberinto = crear_laberinto_medido(configuracion, semilla_actual)
             
-            # Ejecutar algoritmo genético
-            agente_genetico = GeneticAgent(
-                laberinto,
-                tamaño_poblacion=configuracion['tamaño_poblacion'],
-                longitud_cromosoma=configuracion['longitud_cromosoma'],
-                max_generaciones=configuracion['max_generaciones']
-            )
-            resultado_genetico = agente_genetico.ejecutar()
-            resultados_experimento['genetico'].append(resultado_genetico)
+            resumen = []
+            for agente in pendientes:
+                resultado = ejecutar_agente(agente, configuracion, laberinto, semilla_actual, tiempo_laberinto)
+                if self.registro is not None:
+                    self.registro.escribir(configuracion, i, semilla_actual, agente, resultado)
+                if self.conservar_resultados:
+                    resultados_experimento[agente].append(resultado)
+                resumen.append(f"{NOMBRES_AGENTES[agente]}: {resultado.exito}")
             
-            print(f"    Búsqueda: {resultado_busqueda.exito}, Genético: {resultado_genetico.exito}")
+            print(f"    {', '.join(resumen)}")
         
-        self.resultados.append(resultados_experimento)
+        if self.conservar_resultados and tiene_resultados(resultados_experimento):
+            self.resultados.append(resultados_experimento)
         return resultados_experimento
     
-    def generar_reporte(self):
-        """Genera un reporte comparativo de todos los experimentos."""
+    def ejecutar_experimentos(self, configuraciones, procesos=1, tiempo_limite=None):
+        """
+        Ejecuta varias configuraciones.
+
+        Con un solo proceso y sin tiempo límite se ejecutan en serie con
+        ejecutar_experimento; en otro caso se reparten las tareas
+        (configuración, repetición, agente) con el Planificador.
+        """
+        if procesos == 1 and tiempo_limite is None:
+            return [self.ejecutar_experimento(configuracion) for configuracion in configuraciones]
+        
+        from experiments.scheduler import Planificador
+        planificador = Planificador(procesos=procesos, tiempo_limite=tiempo_limite,
+                                    registro=self.registro, conservar_resultados=self.conservar_resultados)
+        resultados = planificador.ejecutar(configuraciones)
+        self.agotadas += planificador.agotadas
+        if self.conservar_resultados:
+            self.resultados.extend(exp for exp in resultados if tiene_resultados(exp))
+        return resultados
+    
+    def resumen(self):
+        """Estadísticas por experimento y agente (ver utils.agregacion.resumir)."""
+        # pandas y scipy se cargan recién al agregar
+        from utils.agregacion import resumir_resultados
+        return resumir_resultados(self.resultados)
+    
+    def generar_reporte(self, resumen=None):
+        """
+        Genera un reporte comparativo de todos los experimentos. `resumen`
+        (de Experimentador.resumen) evita volver a agregar los resultados.
+        """
+        if resumen is None:
+            resumen = self.resumen()
+        
         print("\n" + "="*60)
         print("REPORTE COMPARATIVO DE ALGORITMOS")
         print("="*60)
         
-        for exp in self.resultados:
-            config = exp['configuracion']
-            print(f"\nExperimento: {config['nombre']}")
-            
-            # Estadísticas búsqueda
-            resultados_busqueda = exp['busqueda']
-            exitos_busqueda = sum(1 for r in resultados_busqueda if r.exito)
-            tiempo_busqueda = sum(r.tiempo_ejecucion for r in resultados_busqueda) / len(resultados_busqueda)
-            
-            # Estadísticas genético
-            resultados_genetico = exp['genetico']
-            exitos_genetico = sum(1 for r in resultados_genetico if r.exito)
-            tiempo_genetico = sum(r.tiempo_ejecucion for r in resultados_genetico) / len(resultados_genetico)
-            
-            print(f"Búsqueda A*:   {exitos_busqueda}/{config['repeticiones']} exitos "
-                  f"({exitos_busqueda/config['repeticiones']*100:.1f}%), "
-                  f"Tiempo: {tiempo_busqueda:.4f}s")
+        for _, filas in resumen.groupby('indice_experimento', sort=False):
+            print(f"\nExperimento: {filas['experimento'].iloc[0]}")
             
-            print(f"Algoritmo Genético: {exitos_genetico}/{config['repeticiones']} exitos "
-                  f"({exitos_genetico/config['repeticiones']*100:.1f}%), "
-                  f"Tiempo: {tiempo_genetico:.4f}s")
+            for fila in filas.itertuples(index=False):
+                intervalo = ""
+                if not np.isnan(fila.tiempo_ic_inferior):
+                    intervalo = f", IC 95%: [{fila.tiempo_ic_inferior:.4f}, {fila.tiempo_ic_superior:.4f}]s"
+                print(f"{ETIQUETAS_REPORTE.get(fila.agente, fila.agente + ':')} {fila.exitos}/{fila.repeticiones} exitos "
+                      f"({fila.tasa_exito*100:.1f}%), "
+                      f"Tiempo: {fila.tiempo_promedio:.4f}s{intervalo}")
     
-    def exportar_resultados(self, archivo='resultados.csv'):
+    def exportar_resultados(self, archivo='resultados.csv', resumen=None):
         """Exporta los resultados a un archivo CSV."""
-        exportar_resultados(self.resultados, archivo)
\ No newline at end of file
+        exportar_resultados(self.resultados, archivo, resumen)
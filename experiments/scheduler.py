@@ -0,0 +1,110 @@
+import io
+import os
+import signal
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core.entities import ResultadoBusqueda
+from experiments.experimenter import agentes_configuracion, semillas_repeticiones, crear_laberinto_medido, ejecutar_agente
+
+class TiempoAgotado(Exception):
+    """Una tarea superó el tiempo límite."""
+
+def _interrumpir(signum, frame):
+    raise TiempoAgotado()
+
+def _ejecutar_tarea(tarea, tiempo_limite):
+    """
+    Ejecuta una tarea (configuración, repetición, agente) dentro de un proceso.
+
+    El laberinto se reconstruye a partir de la configuración y la semilla, por
+    lo que cada agente ve exactamente el mismo laberinto que en la ejecución en
+    serie. La salida por consola de los agentes se descarta. Si el sistema lo
+    permite (SIGALRM), la tarea se interrumpe al superar `tiempo_limite`.
+    """
+    indice_configuracion, configuracion, repeticion, semilla, agente = tarea
+    limitar = tiempo_limite is not None and hasattr(signal, 'SIGALRM')
+
+    if limitar:
+        signal.signal(signal.SIGALRM, _interrumpir)
+        signal.setitimer(signal.ITIMER_REAL, tiempo_limite)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            laberinto, tiempo_laberinto = crear_laberinto_medido(configuracion, semilla)
+            resultado = ejecutar_agente(agente, configuracion, laberinto, semilla, tiempo_laberinto)
+        agotado = False
+    except TiempoAgotado:
+        resultado = ResultadoBusqueda(tiempo_ejecucion=tiempo_limite)
+        agotado = True
+    finally:
+        if limitar:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    return (indice_configuracion, repeticion, agente), resultado, agotado
+
+class Planificador:
+    """
+    Reparte las tareas (configuración, repetición, agente) de un conjunto de
+    experimentos entre varios procesos.
+
+    Las semillas de cada repetición se fijan antes de repartir las tareas y
+    los resultados se ordenan por repetición (es decir, por semilla), de modo
+    que la salida no depende del orden en que terminan los procesos.
+
+    Con un `registro` cada resultado se escribe apenas llega y se omiten las
+    tareas ya registradas; con `conservar_resultados=False` no se guardan en
+    memoria. Las tareas que agotan el tiempo límite no se cuentan como
+    repeticiones (no bajan la tasa de éxito): se informan en `agotadas` y
+    se registran marcadas para reintentarlas al retomar.
+    """
+
+    def __init__(self, procesos=None, tiempo_limite=None, registro=None, conservar_resultados=True):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tiempo_limite = tiempo_limite
+        self.registro = registro
+        self.conservar_resultados = conservar_resultados
+        self.agotadas = 0
+
+    def ejecutar(self, configuraciones):
+        """Ejecuta todas las configuraciones y devuelve sus resultados con el formato de Experimentador."""
+        tareas = []
+        semillas = [semillas_repeticiones(configuracion) for configuracion in configuraciones]
+        agentes = [agentes_configuracion(configuracion) for configuracion in configuraciones]
+        for indice, configuracion in enumerate(configuraciones):
+            for repeticion, semilla in enumerate(semillas[indice]):
+                for agente in agentes[indice]:
+                    if self.registro is None or not self.registro.completado(configuracion, semilla, agente):
+                        tareas.append((indice, configuracion, repeticion, semilla, agente))
+
+        print(f"Ejecutando {len(tareas)} tareas en {self.procesos} procesos...")
+
+        resultados_tareas = {}
+        with ProcessPoolExecutor(max_workers=self.procesos) as ejecutor:
+            futuros = [ejecutor.submit(_ejecutar_tarea, tarea, self.tiempo_limite) for tarea in tareas]
+            for completadas, futuro in enumerate(as_completed(futuros), start=1):
+                clave, resultado, agotado = futuro.result()
+                indice, repeticion, agente = clave
+                if self.registro is not None:
+                    self.registro.escribir(configuraciones[indice], repeticion,
+                                           semillas[indice][repeticion], agente, resultado, agotado)
+                if agotado:
+                    self.agotadas += 1
+                elif self.conservar_resultados:
+                    resultados_tareas[clave] = resultado
+
+                nombre = configuraciones[indice]['nombre']
+                estado = "tiempo agotado" if agotado else f"éxito: {resultado.exito}"
+                print(f"  [{completadas}/{len(tareas)}] {nombre} - repetición {repeticion + 1} - {agente} ({estado})")
+
+        if self.agotadas:
+            print(f"{self.agotadas} tareas agotaron el tiempo límite y no se incluyen en los resultados")
+
+        resultados = []
+        for indice, configuracion in enumerate(configuraciones):
+            resultados_experimento = {'configuracion': configuracion}
+            for agente in agentes[indice]:
+                resultados_experimento[agente] = [resultados_tareas[(indice, repeticion, agente)]
+                                                  for repeticion in range(configuracion['repeticiones'])
+                                                  if (indice, repeticion, agente) in resultados_tareas]
+            resultados.append(resultados_experimento)
+
+        return resultados
@@ -0,0 +1,183 @@
+import os
+import json
+import zlib
+import base64
+import hashlib
+from core.entities import ResultadoBusqueda, empaquetar_camino, desempaquetar_camino
+
+# Campos de ResultadoBusqueda que se guardan en cada registro (los registros
+# anteriores a los contadores del memo de fitness no los tienen: valen 0)
+CAMPOS_RESULTADO = ('exito', 'longitud_camino', 'nodos_expandidos', 'tiempo_ejecucion',
+                    'fitness_final', 'generaciones', 'aciertos_memo', 'fallos_memo')
+
+# Campos de la configuración que no cambian el resultado de una repetición.
+# El nombre sí forma parte de la clave: dos configuraciones con los mismos
+# parámetros y distinto nombre se registran, retoman y grafican por separado.
+CAMPOS_SIN_EFECTO = ('repeticiones', 'semilla_base', 'cache_laberintos',
+                     'instrumentar', 'instrumentar_memoria', 'agentes')
+
+def clave_configuracion(configuracion):
+    """Identificador estable del nombre y los parámetros que determinan el resultado de una repetición."""
+    parametros = {campo: valor for campo, valor in configuracion.items() if campo not in CAMPOS_SIN_EFECTO}
+    texto = json.dumps(parametros, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()[:16]
+
+def codificar_camino(camino):
+    """Camino empaquetado a 2 bits por movimiento, comprimido y en base64."""
+    return codificar_empaquetado(*empaquetar_camino(camino))
+
+def codificar_empaquetado(inicio, cantidad, datos):
+    """codificar_camino para un camino ya empaquetado (ResultadoBusqueda.camino_empaquetado)."""
+    return {
+        'inicio': inicio,
+        'movimientos': cantidad,
+        'datos': base64.b64encode(zlib.compress(datos)).decode('ascii')
+    }
+
+def decodificar_camino(codificado):
+    """Inverso de codificar_camino."""
+    datos = zlib.decompress(base64.b64decode(codificado['datos']))
+    inicio = tuple(codificado['inicio']) if codificado['inicio'] is not None else None
+    return desempaquetar_camino(inicio, codificado['movimientos'], datos)
+
+class RegistroResultados:
+    """
+    Registro de resultados en formato JSON Lines, de solo agregado.
+
+    Cada repetición de cada agente se escribe (y se vacía a disco) apenas
+    termina, con sus métricas crudas y, opcionalmente, el camino comprimido.
+    La primera vez que aparece una configuración se escribe un registro con
+    sus parámetros. Al abrir un archivo existente se leen las repeticiones ya
+    registradas, de modo que un barrido interrumpido puede retomarse
+    omitiendo los pares (configuración, semilla) completados. Las tareas que
+    agotaron el tiempo límite se registran con 'agotado' y no cuentan como
+    completadas: se vuelven a intentar al retomar.
+    """
+
+    def __init__(self, archivo, guardar_caminos=False):
+        self.archivo = archivo
+        self.guardar_caminos = guardar_caminos
+        self.completados = set()
+        self.configuraciones = set()
+
+        if os.path.exists(archivo):
+            for registro in leer_registros(archivo):
+                if registro['tipo'] == 'configuracion':
+                    self.configuraciones.add(registro['clave'])
+                elif not registro.get('agotado'):
+                    self.completados.add((registro['clave'], registro['semilla'], registro['agente']))
+
+        self._archivo = open(archivo, 'a+', encoding='utf-8')
+        # Si una ejecución anterior se cortó a mitad de línea, se empieza en una línea nueva
+        if self._archivo.tell() > 0:
+            self._archivo.seek(self._archivo.tell() - 1)
+            if self._archivo.read(1) != '\n':
+                self._archivo.write('\n')
+
+    def completado(self, configuracion, semilla, agente):
+        """Indica si la repetición con esa semilla ya está registrada para el agente."""
+        return (clave_configuracion(configuracion), semilla, agente) in self.completados
+
+    def escribir(self, configuracion, repeticion, semilla, agente, resultado, agotado=False):
+        """
+        Agrega el resultado de una repetición y lo vacía a disco. Con
+        `agotado` la tarea se interrumpió por tiempo límite: se registra para
+        dejar constancia, pero no se marca como completada.
+        """
+        clave = clave_configuracion(configuracion)
+        if clave not in self.configuraciones:
+            self._escribir_linea({'tipo': 'configuracion', 'clave': clave, 'configuracion': configuracion})
+            self.configuraciones.add(clave)
+
+        registro = {
+            'tipo': 'ejecucion',
+            'clave': clave,
+            'experimento': configuracion['nombre'],
+            'repeticion': repeticion,
+            'semilla': semilla,
+            'agente': agente
+        }
+        if agotado:
+            registro['agotado'] = True
+        for campo in CAMPOS_RESULTADO:
+            registro[campo] = getattr(resultado, campo)
+        if resultado.metricas is not None:
+            registro['metricas'] = resultado.metricas
+        if self.guardar_caminos:
+            try:
+                registro['camino'] = codificar_empaquetado(*resultado.camino_empaquetado())
+            except ValueError:
+                registro['camino_celdas'] = [list(posicion) for posicion in resultado.camino]
+
+        self._escribir_linea(registro)
+        if not agotado:
+            self.completados.add((clave, semilla, agente))
+
+    def _escribir_linea(self, registro):
+        self._archivo.write(json.dumps(registro, ensure_ascii=False, default=str) + '\n')
+        self._archivo.flush()
+
+    def cerrar(self):
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+def leer_registros(archivo):
+    """Lee los registros del archivo, ignorando una última línea incompleta."""
+    with open(archivo, encoding='utf-8') as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError:
+                continue
+
+def cargar_resultados(archivo):
+    """
+    Reconstruye desde un registro la lista de experimentos con el formato de
+    Experimentador.resultados, con las repeticiones ordenadas por semilla.
+    Las tareas que agotaron el tiempo límite no se incluyen (ver
+    contar_agotados).
+    """
+    configuraciones = {}
+    ejecuciones = {}
+    for registro in leer_registros(archivo):
+        if registro['tipo'] == 'configuracion':
+            configuraciones.setdefault(registro['clave'], registro['configuracion'])
+        elif not registro.get('agotado'):
+            ejecuciones.setdefault(registro['clave'], []).append(registro)
+
+    resultados = []
+    for clave, configuracion in configuraciones.items():
+        experimento = {'configuracion': configuracion, 'busqueda': [], 'genetico': []}
+        for registro in sorted(ejecuciones.get(clave, []), key=lambda r: (r['semilla'], r['repeticion'])):
+            if 'camino' in registro:
+                camino = decodificar_camino(registro['camino'])
+            else:
+                camino = [tuple(posicion) for posicion in registro.get('camino_celdas', [])]
+            resultado = ResultadoBusqueda(camino=camino, metricas=registro.get('metricas'),
+                                          **{campo: registro[campo] for campo in CAMPOS_RESULTADO
+                                             if campo in registro})
+            experimento.setdefault(registro['agente'], []).append(resultado)
+        resultados.append(experimento)
+    return resultados
+
+def contar_agotados(archivo):
+    """
+    Cantidad de tareas del registro que agotaron el tiempo límite y todavía
+    no tienen un resultado completo (se volverán a intentar al retomar).
+    """
+    agotados = set()
+    completados = set()
+    for registro in leer_registros(archivo):
+        if registro['tipo'] == 'configuracion':
+            continue
+        tarea = (registro['clave'], registro['semilla'], registro['agente'])
+        (agotados if registro.get('agotado') else completados).add(tarea)
+    return len(agotados - completados)
@@ -1,49 +1,14 @@
-from core.maze import Maze
-from agents.search_agent import SearchAgent
-from agents.genetic_agent import GeneticAgent
-from experiments.experimenter import Experimentador
+# El laberinto, los agentes y el experimentador (numpy, scipy, pandas) se
+# importan dentro de cada opción del menú, para que la línea de comandos
+# (cli.py) arranque sin cargarlos
+from experiments.configuraciones import CONFIGURACIONES_PREDEFINIDAS
 from utils.helpers import (clear_screen, obtener_entero, obtener_float, 
-                          obtener_semilla_configuracion, generar_configuracion_aleatoria)
+                          obtener_semilla_configuracion, generar_configuracion_aleatoria,
+                          derivar_semilla, FLUJO_GENETICO)
+import os
 import random
 import math
 
-# Configuraciones predefinidas
-CONFIGURACIONES_PREDEFINIDAS = [
-    {
-        'nombre': 'Pequeño_BajaDensidad',
-        'tamaño': 15,
-        'densidad_muros': 0.1,
-        'cantidad_salidas': math.ceil(15/10) + 2,  # 2 + 2 = 4
-        'prob_mover_muro': 0.05,
-        'tamaño_poblacion': 50,
-        'longitud_cromosoma': 45,
-        'max_generaciones': 50,
-        'repeticiones': 3
-    },
-    {
-        'nombre': 'Medio_MediaDensidad',
-        'tamaño': 30,
-        'densidad_muros': 0.2,
-        'cantidad_salidas': math.ceil(30/10) + 2,  # 3 + 2 = 5
-        'prob_mover_muro': 0.1,
-        'tamaño_poblacion': 100,
-        'longitud_cromosoma': 90,
-        'max_generaciones': 100,
-        'repeticiones': 3
-    },
-    {
-        'nombre': 'Grande_AltaDensidad',
-        'tamaño': 50,
-        'densidad_muros': 0.3,
-        'cantidad_salidas': math.ceil(50/10) + 2,  # 5 + 2 = 7
-        'prob_mover_muro': 0.15,
-        'tamaño_poblacion': 150,
-        'longitud_cromosoma': 150,
-        'max_generaciones': 150,
-        'repeticiones': 3
-    }
-]
-
 def configuracion_personalizada():
     """Permite al usuario configurar todos los parámetros del laberinto."""
     print("\n" + "="*50)
@@ -114,6 +79,10 @@ def configuracion_personalizada():
 
 def demostracion_basica():
     """Demostración básica del funcionamiento del laberinto y agentes."""
+    from core.maze import Maze
+    from agents.search_agent import SearchAgent
+    from agents.genetic_agent import GeneticAgent
+    
     clear_screen()
     print("=== DEMOSTRACIÓN BÁSICA ===")
     
@@ -151,7 +120,8 @@ def demostracion_basica():
         laberinto,
         tamaño_poblacion=50,
         longitud_cromosoma=min(50, tamaño * 3),
-        max_generaciones=100
+        max_generaciones=100,
+        semilla=derivar_semilla(semilla, FLUJO_GENETICO)
     )
     resultado_genetico = agente_genetico.ejecutar()
     
@@ -165,6 +135,8 @@ def demostracion_basica():
 
 def ejecutar_experimento_personalizado():
     """Ejecuta un experimento con configuración personalizada."""
+    from experiments.experimenter import Experimentador
+    
     clear_screen()
     
     config = configuracion_personalizada()
@@ -206,10 +178,11 @@ def ejecutar_experimento_personalizado():
         
         print(f"\nEjecutando experimento: {nombre_experimento}")
         experimentador.ejecutar_experimento(config_experimento)
-        experimentador.generar_reporte()
+        resumen = experimentador.resumen()
+        experimentador.generar_reporte(resumen)
         
         from visualization.plotter import Plotter
-        Plotter.graficar_resultados(experimentador.resultados)
+        Plotter.graficar_resultados(experimentador.resultados, resumen)
         
         # Preguntar si exportar resultados
         exportar = input("\n¿Exportar resultados a CSV? (s/n): ").strip().lower()
@@ -217,7 +190,7 @@ def ejecutar_experimento_personalizado():
             nombre_archivo = input("Nombre del archivo [resultados.csv]: ").strip()
             if not nombre_archivo:
                 nombre_archivo = 'resultados.csv'
-            experimentador.exportar_resultados(nombre_archivo)
+            experimentador.exportar_resultados(nombre_archivo, resumen)
         
         input("\nPresione Enter para continuar...")
     else:
@@ -226,6 +199,8 @@ def ejecutar_experimento_personalizado():
 
 def ejecutar_experimentos_predefinidos():
     """Ejecuta un conjunto de experimentos predefinidos."""
+    from experiments.experimenter import Experimentador
+    
     clear_screen()
     print("=== EXPERIMENTOS PREDEFINIDOS ===")
     
@@ -240,10 +215,11 @@ def ejecutar_experimentos_predefinidos():
         
         experimentador.ejecutar_experimento(config)
     
-    experimentador.generar_reporte()
+    resumen = experimentador.resumen()
+    experimentador.generar_reporte(resumen)
     
     from visualization.plotter import Plotter
-    Plotter.graficar_resultados(experimentador.resultados)
+    Plotter.graficar_resultados(experimentador.resultados, resumen)
     
     # Exportar resultados
     exportar = input("\n¿Exportar resultados a CSV? (s/n): ").strip().lower()
@@ -251,13 +227,15 @@ def ejecutar_experimentos_predefinidos():
         nombre_archivo = input("Nombre del archivo [resultados_predefinidos.csv]: ").strip()
         if not nombre_archivo:
             nombre_archivo = 'resultados_predefinidos.csv'
-        experimentador.exportar_resultados(nombre_archivo)
+        experimentador.exportar_resultados(nombre_archivo, resumen)
         print(f"Resultados exportados a {nombre_archivo}")
     
     input("\nPresione Enter para continuar...")
 
 def ejecutar_experimentos_aleatorios():
     """Ejecuta experimentos con parámetros aleatorios."""
+    from experiments.experimenter import Experimentador
+    
     clear_screen()
     print("=== EXPERIMENTOS ALEATORIOS ===")
     print("Se generarán configuraciones aleatorias de laberintos y algoritmos.")
@@ -272,6 +250,7 @@ def ejecutar_experimentos_aleatorios():
     
     total_experimentos = obtener_entero("Número de configuraciones aleatorias", 1, 20, 5)
     repeticiones = obtener_entero("Repeticiones por configuración", 1, 10, 3)
+    procesos = obtener_entero("Procesos en paralelo", 1, os.cpu_count() or 1, 1)
     
     print(f"\nSe ejecutarán {total_experimentos} configuraciones diferentes")
     print(f"con {repeticiones} repeticiones cada una.")
@@ -290,6 +269,7 @@ def ejecutar_experimentos_aleatorios():
     
     print(f"\nGenerando {total_experimentos} configuraciones aleatorias...")
     
+    configuraciones = []
     for i in range(total_experimentos):
         config = generar_configuracion_aleatoria()
         config['repeticiones'] = repeticiones
@@ -315,16 +295,19 @@ def ejecutar_experimentos_aleatorios():
         print(f"  Prob. mover muros: {config['prob_mover_muro']}")
         print(f"  Salidas: {config['cantidad_salidas']} (ceil({config['tamaño']}/10) + 2 = {math.ceil(config['tamaño']/10) + 2})")
         
-        experimentador.ejecutar_experimento(config_experimento)
+        configuraciones.append(config_experimento)
+    
+    experimentador.ejecutar_experimentos(configuraciones, procesos=procesos)
     
     print(f"\n{'='*60}")
     print("EXPERIMENTOS ALEATORIOS COMPLETADOS")
     print(f"{'='*60}")
     
-    experimentador.generar_reporte()
+    resumen = experimentador.resumen()
+    experimentador.generar_reporte(resumen)
     
     from visualization.plotter import Plotter
-    Plotter.graficar_resultados(experimentador.resultados)
+    Plotter.graficar_resultados(experimentador.resultados, resumen)
     
     # Exportar resultados
     exportar = input("\n¿Exportar resultados a CSV? (s/n): ").strip().lower()
@@ -332,7 +315,7 @@ def ejecutar_experimentos_aleatorios():
         nombre_archivo = input("Nombre del archivo [resultados_aleatorios.csv]: ").strip()
         if not nombre_archivo:
             nombre_archivo = 'resultados_aleatorios.csv'
-        experimentador.exportar_resultados(nombre_archivo)
+        experimentador.exportar_resultados(nombre_archivo, resumen)
         print(f"Resultados exportados a {nombre_archivo}")
     
     input("\nPresione Enter para continuar...")
@@ -369,4 +352,8 @@ def main():
             input("Presione Enter para continuar...")
 
 if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        from cli import main as main_cli
+        sys.exit(main_cli(sys.argv[1:]))
     main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Equivalencias entre implementaciones de los agentes: las estrategias de
+búsqueda, D* Lite y las formas de evaluar el fitness deben dar los mismos
+resultados que la versión de referencia en cada representación.
+
+    python -m pytest -q
+"""
+import copy
+import numpy as np
+import pytest
+
+from core.maze import Maze
+from agents.search_agent import SearchAgent, ESTRATEGIAS
+from agents.dstar_agent import DStarLiteAgent
+from agents.genetic_agent import GeneticAgent
+from utils.instrumentacion import Instrumentacion
+
+REPRESENTACIONES = ('lista', 'numpy', 'bits')
+SEMILLAS = range(12)
+
+def laberinto(semilla, representacion, tamaño=20, densidad=0.25, prob_mover_muro=0.1):
+    return Maze(tamaño, densidad_muros=densidad, semilla=semilla, representacion=representacion,
+                probabilidad_mover_muro=prob_mover_muro)
+
+def verificar_camino(laberinto, camino):
+    """El camino va del inicio a la salida real, con pasos de una celda por celdas libres."""
+    assert camino[0] == laberinto.inicio
+    assert camino[-1] == laberinto.salida_real
+    for (fila, columna), (siguiente_fila, siguiente_columna) in zip(camino, camino[1:]):
+        assert abs(fila - siguiente_fila) + abs(columna - siguiente_columna) == 1
+    assert all(laberinto.es_libre(posicion) for posicion in camino)
+
+@pytest.mark.parametrize('representacion', REPRESENTACIONES)
+@pytest.mark.parametrize('estrategia', ESTRATEGIAS)
+def test_estrategias_igualan_a_estrella(estrategia, representacion):
+    for semilla in SEMILLAS:
+        maze = laberinto(semilla, representacion)
+        referencia = SearchAgent(maze, verificar_alcance=False).ejecutar()
+        resultado = SearchAgent(maze, estrategia=estrategia, verificar_alcance=False).ejecutar()
+        assert resultado.exito == referencia.exito
+        assert resultado.longitud_camino == referencia.longitud_camino
+        if resultado.exito:
+            verificar_camino(maze, resultado.camino)
+
+@pytest.mark.parametrize('representacion', REPRESENTACIONES)
+def test_heuristica_campo_y_desempate_aleatorio(representacion):
+    for semilla in SEMILLAS:
+        maze = laberinto(semilla, representacion)
+        referencia = SearchAgent(maze, verificar_alcance=False).ejecutar()
+        for agente in (SearchAgent(maze, tipo_heuristica='campo', verificar_alcance=False),
+                       SearchAgent(maze, semilla=semilla, verificar_alcance=False)):
+            resultado = agente.ejecutar()
+            assert resultado.longitud_camino == referencia.longitud_camino
+            if resultado.exito:
+                verificar_camino(maze, resultado.camino)
+
+def test_numpy_y_bits_dan_el_mismo_camino():
+    # 'numpy' y 'bits' generan la misma grilla; 'lista' usa otro generador
+    for semilla in SEMILLAS:
+        caminos = [SearchAgent(laberinto(semilla, representacion)).ejecutar().camino
+                   for representacion in ('numpy', 'bits')]
+        assert caminos[0] == caminos[1]
+
+@pytest.mark.parametrize('representacion', REPRESENTACIONES)
+def test_sondeo_termina_en_la_salida_real(representacion):
+    for semilla in SEMILLAS:
+        maze = Maze(15, densidad_muros=0.2, cantidad_salidas=6, semilla=semilla, representacion=representacion)
+        camino, exito = SearchAgent(maze, modo='multiobjetivo').sondear_salidas()
+        assert exito == maze.es_resoluble()
+        if exito:
+            verificar_camino(maze, camino)
+            assert camino.count(maze.salida_real) == 1
+
+@pytest.mark.parametrize('representacion', REPRESENTACIONES)
+def test_dstar_sin_muros_moviles_iguala_a_estrella(representacion):
+    for semilla in SEMILLAS:
+        maze = laberinto(semilla, representacion, prob_mover_muro=0)
+        referencia = SearchAgent(maze, verificar_alcance=False).ejecutar()
+        resultado = DStarLiteAgent(copy.deepcopy(maze)).ejecutar()
+        assert resultado.exito == referencia.exito
+        assert resultado.longitud_camino == referencia.longitud_camino
+        if resultado.exito:
+            verificar_camino(maze, resultado.camino)
+
+@pytest.mark.parametrize('representacion', REPRESENTACIONES)
+def test_dstar_con_muros_moviles(representacion):
+    for semilla in SEMILLAS:
+        maze = laberinto(semilla, representacion, prob_mover_muro=0.2)
+        resultado = DStarLiteAgent(maze).ejecutar()
+        camino = resultado.camino
+        assert camino[0] == maze.inicio
+        for (fila, columna), (siguiente_fila, siguiente_columna) in zip(camino, camino[1:]):
+            assert abs(fila - siguiente_fila) + abs(columna - siguiente_columna) == 1
+        if resultado.exito:
+            assert camino[-1] == maze.salida_real
+
+@pytest.mark.parametrize('distancia', ('manhattan', 'campo'))
+@pytest.mark.parametrize('representacion', REPRESENTACIONES)
+def test_fitness_vectorizado_iguala_escalar(representacion, distancia):
+    for semilla in SEMILLAS:
+        maze = laberinto(semilla, representacion)
+        agente = GeneticAgent(maze, tamaño_poblacion=40, longitud_cromosoma=80, distancia=distancia, semilla=semilla)
+        poblacion = [agente.generar_cromosoma() for _ in range(agente.tamaño_poblacion)]
+        escalar = [agente.calcular_fitness(cromosoma) for cromosoma in poblacion]
+        vectorizado = agente.calcular_fitness_poblacion(np.array(poblacion, dtype=np.int8))
+        np.testing.assert_allclose(vectorizado, escalar)
+
+@pytest.mark.parametrize('representacion', REPRESENTACIONES)
+def test_fitness_con_prefijos_iguala_escalar(representacion):
+    for semilla in SEMILLAS:
+        maze = laberinto(semilla, representacion)
+        agente = GeneticAgent(maze, longitud_cromosoma=150, semilla=semilla)
+        con_prefijos = GeneticAgent(maze, longitud_cromosoma=150, semilla=semilla, cache_prefijos=64)
+        poblacion = [agente.generar_cromosoma() for _ in range(30)]
+        # Cromosomas que comparten prefijos largos, como los hijos de un cruce
+        poblacion += [poblacion[i][:100] + poblacion[i + 1][100:] for i in range(len(poblacion) - 1)]
+        for cromosoma in poblacion:
+            assert con_prefijos.calcular_fitness(cromosoma) == agente.calcular_fitness(cromosoma)
+
+def test_cache_de_prefijos_con_evaluacion_por_defecto():
+    maze = laberinto(3, 'numpy', densidad=0.15)
+    instrumentacion = Instrumentacion()
+    agente = GeneticAgent(maze, longitud_cromosoma=150, max_generaciones=5, semilla=3,
+                          cache_prefijos=1024, instrumentacion=instrumentacion)
+    assert agente.evaluacion == 'vectorizada'
+    agente.ejecutar()
+    assert instrumentacion.contadores.get('aciertos_prefijos', 0) > 0
@@ -0,0 +1,22 @@
+"""
+El menú (main.py) y la línea de comandos (cli.py) deben arrancar sin cargar
+numpy, scipy, pandas ni matplotlib: se importan dentro de cada opción.
+
+    python -m pytest -q
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADOS = ('numpy', 'scipy', 'pandas', 'matplotlib')
+
+@pytest.mark.parametrize('modulo', ('main', 'cli'))
+def test_arranque_sin_importaciones_pesadas(modulo):
+    # En un proceso nuevo: en este ya están cargados por las otras pruebas
+    codigo = f"import sys, {modulo}; print(' '.join(m for m in {PESADOS!r} if m in sys.modules))"
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True,
+                            text=True, check=True).stdout
+    assert salida.split() == []
@@ -0,0 +1,109 @@
+"""
+Agregación de resultados en una tabla columnar.
+
+tabla_resultados recorre una sola vez la lista de experimentos (con el
+formato de Experimentador.resultados) y la convierte en un DataFrame con una
+fila por repetición de cada agente. resumir calcula sobre esa tabla, con
+groupby, las estadísticas que consumen el reporte, la exportación a CSV y
+los gráficos.
+"""
+import operator
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Tipo de columna de los campos de ResultadoBusqueda que pueden copiarse a la tabla
+TIPOS_CAMPOS = {
+    'exito': np.bool_,
+    'tiempo_ejecucion': np.float64,
+    'longitud_camino': np.float64,
+    'nodos_expandidos': np.int64,
+    'fitness_final': np.float64,
+    'generaciones': np.int64
+}
+
+# Campos que se copian por defecto: los que usan el reporte, la exportación y los gráficos
+CAMPOS_TABLA = ('exito', 'tiempo_ejecucion', 'longitud_camino')
+
+def _categorica(valores, cantidades):
+    """Columna categórica que repite cada valor de `valores` según `cantidades`."""
+    codigos, categorias = pd.factorize(np.array(valores, dtype=object))
+    return pd.Categorical.from_codes(np.repeat(codigos, cantidades), categorias)
+
+def tabla_resultados(resultados, campos=CAMPOS_TABLA):
+    """
+    DataFrame con una fila por (experimento, agente, repetición). Las
+    columnas son el índice y el nombre del experimento, el agente, la
+    repetición y los `campos` indicados (claves de TIPOS_CAMPOS).
+    """
+    objetos = []
+    indices, nombres, agentes, cantidades = [], [], [], []
+    for indice, exp in enumerate(resultados):
+        for agente, lista in exp.items():
+            if agente == 'configuracion' or not lista:
+                continue
+            objetos.extend(lista)
+            indices.append(indice)
+            nombres.append(exp['configuracion']['nombre'])
+            agentes.append(agente)
+            cantidades.append(len(lista))
+
+    # Columnas con tipo explícito: evita que pandas infiera el tipo valor por valor
+    columnas = {
+        'indice_experimento': np.repeat(np.array(indices, dtype=np.int64), cantidades),
+        'experimento': _categorica(nombres, cantidades),
+        'agente': _categorica(agentes, cantidades),
+        'repeticion': np.concatenate([np.arange(n) for n in cantidades]) if cantidades else np.zeros(0, dtype=np.int64)
+    }
+    for campo in campos:
+        columnas[campo] = np.fromiter(map(operator.attrgetter(campo), objetos), dtype=TIPOS_CAMPOS[campo],
+                                      count=len(objetos))
+    return pd.DataFrame(columnas)
+
+def resumir(tabla, confianza=0.95):
+    """
+    Estadísticas por experimento y agente, en el orden de la tabla.
+
+    Columnas: repeticiones, exitos, tasa_exito, tiempo_promedio,
+    tiempo_varianza, tiempo_p50, tiempo_p90, tiempo_ic_inferior y
+    tiempo_ic_superior (intervalo de confianza t de Student de nivel
+    `confianza`, con el extremo inferior acotado en 0 porque los tiempos no
+    son negativos; NaN con una sola repetición), longitud_promedio (solo
+    repeticiones exitosas, 0 si no hay) y eficiencia (tasa de éxito sobre
+    tiempo promedio).
+    """
+    tabla = tabla.assign(longitud_exito=tabla['longitud_camino'].where(tabla['exito']))
+    grupos = tabla.groupby(['indice_experimento', 'experimento', 'agente'], sort=False, observed=True)
+
+    resumen = grupos.agg(
+        repeticiones=('exito', 'size'),
+        exitos=('exito', 'sum'),
+        tiempo_promedio=('tiempo_ejecucion', 'mean'),
+        tiempo_varianza=('tiempo_ejecucion', 'var'),
+        tiempo_desvio=('tiempo_ejecucion', 'std'),
+        longitud_promedio=('longitud_exito', 'mean')
+    )
+    resumen['tiempo_p50'] = grupos['tiempo_ejecucion'].quantile(0.5)
+    resumen['tiempo_p90'] = grupos['tiempo_ejecucion'].quantile(0.9)
+
+    resumen['tasa_exito'] = resumen['exitos'] / resumen['repeticiones']
+    resumen['longitud_promedio'] = resumen['longitud_promedio'].fillna(0)
+    tiempo = resumen['tiempo_promedio'].to_numpy()
+    resumen['eficiencia'] = np.divide(resumen['tasa_exito'].to_numpy(), tiempo,
+                                      out=np.zeros(len(resumen)), where=tiempo > 0)
+
+    n = resumen['repeticiones'].to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        margen = stats.t.ppf((1 + confianza) / 2, n - 1) * resumen['tiempo_desvio'].to_numpy() / np.sqrt(n)
+    resumen['tiempo_ic_inferior'] = np.maximum(tiempo - margen, 0)
+    resumen['tiempo_ic_superior'] = tiempo + margen
+
+    return resumen.drop(columns='tiempo_desvio').reset_index()
+
+def resumir_resultados(resultados, confianza=0.95):
+    """resumir(tabla_resultados(resultados))."""
+    return resumir(tabla_resultados(resultados), confianza)
+
+def pivotar(resumen, columna):
+    """Valores de `columna` con una fila por experimento (en orden) y una columna por agente."""
+    return resumen.pivot(index=['indice_experimento', 'experimento'], columns='agente', values=columna)
@@ -3,6 +3,11 @@ import time
 import csv
 import math
 
+# Flujos aleatorios que se derivan de la semilla de cada repetición (ver derivar_semilla)
+FLUJO_REGENERACION = 0
+FLUJO_GENETICO = 1
+FLUJO_DESEMPATE = 2
+
 def medir_tiempo(func):
     """Decorador para medir el tiempo de ejecución de una función."""
     def wrapper(*args, **kwargs):
@@ -17,6 +22,21 @@ def generar_semilla_aleatoria():
     """Genera una semilla aleatoria para reproducibilidad."""
     return random.randint(1, 10000)
 
+def derivar_semilla(semilla, *flujo):
+    """
+    Semilla de 64 bits del flujo `flujo` (enteros no negativos) de la semilla
+    maestra, derivada con numpy.random.SeedSequence como el hijo
+    correspondiente de spawn(). Flujos distintos dan secuencias
+    independientes y el resultado no depende del orden en que se pidan ni del
+    proceso que las pida. Sin semilla maestra devuelve None.
+    """
+    if semilla is None:
+        return None
+    # Importado aquí para que main.py y cli.py arranquen sin cargar numpy
+    import numpy as np
+    secuencia = np.random.SeedSequence(semilla, spawn_key=flujo)
+    return int(secuencia.generate_state(1, np.uint64)[0])
+
 def validar_parametros_laberinto(tamaño, densidad_muros, cantidad_salidas, prob_mover_muro):
     """Valida que los parámetros del laberinto sean correctos."""
     assert tamaño > 0, "El tamaño debe ser mayor a 0"
@@ -100,13 +120,13 @@ def obtener_semilla_configuracion():
 def generar_configuracion_aleatoria(semilla_base=None):
     """Genera una configuración aleatoria completa."""
 
-    random.seed(semilla_base)
+    aleatorio = random.Random(semilla_base)
     
-    tamaño = random.randint(10, 100)
+    tamaño = aleatorio.randint(10, 100)
     
     # Parámetros aleatorios
-    densidad = round(random.uniform(0.1, 0.5), 2)
-    prob_mover_muro = round(random.uniform(0.05, 0.4), 2)
+    densidad = round(aleatorio.uniform(0.1, 0.5), 2)
+    prob_mover_muro = round(aleatorio.uniform(0.05, 0.4), 2)
     
     cantidad_salidas_base = math.ceil(tamaño / 10) + 2
     max_salidas_posibles = min(15, 2 * tamaño - 1)
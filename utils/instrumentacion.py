@@ -0,0 +1,143 @@
+"""
+Instrumentación opcional de las rutas críticas de los agentes.
+
+Una Instrumentacion acumula el tiempo de cada fase (con
+time.perf_counter_ns), contadores de eventos y, si se pide, el pico de
+memoria medido con tracemalloc. Sin instrumentación los agentes usan
+INSTRUMENTACION_NULA, cuyas operaciones no hacen nada; los bucles internos
+consultan `activa` una sola vez y solo toman tiempos cuando está activa, de
+modo que desactivada no agrega un costo apreciable.
+
+Fases que registran los agentes:
+    'generacion_laberinto': creación del laberinto de la repetición
+    'heuristica': evaluación de la heurística de A*, A* bidireccional y JPS
+                  (con 'campo', el cálculo del campo); BFS no tiene heurística
+    'cola': inserciones y extracciones de la cola de cada estrategia de búsqueda
+    'reconstruccion': reconstrucción del camino encontrado
+    'fitness': evaluación del fitness de la población
+    'seleccion', 'cruce', 'mutacion': operadores del genético
+"""
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+class _Fase:
+    """Administrador de contexto que suma la duración del bloque a una fase."""
+    __slots__ = ('instrumentacion', 'nombre', 'inicio')
+
+    def __init__(self, instrumentacion, nombre):
+        self.instrumentacion = instrumentacion
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.instrumentacion.sumar_tiempo(self.nombre, time.perf_counter_ns() - self.inicio)
+
+class Instrumentacion:
+    """Tiempos por fase en nanosegundos, contadores y pico de memoria opcional."""
+    activa = True
+
+    def __init__(self, memoria=False):
+        self.memoria = memoria
+        self.tiempos = {}
+        self.contadores = {}
+        self.pico_memoria = None
+        self._traza_propia = False
+
+    def fase(self, nombre):
+        """Bloque `with` cuya duración se suma a la fase `nombre`."""
+        return _Fase(self, nombre)
+
+    def sumar_tiempo(self, fase, nanosegundos):
+        self.tiempos[fase] = self.tiempos.get(fase, 0) + nanosegundos
+
+    def contar(self, contador, cantidad=1):
+        self.contadores[contador] = self.contadores.get(contador, 0) + cantidad
+
+    def iniciar_memoria(self):
+        """Empieza a medir el pico de memoria (si se pidió) con tracemalloc."""
+        if not self.memoria:
+            return
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            self._traza_propia = True
+
+    def detener_memoria(self):
+        """Registra el pico de memoria desde iniciar_memoria y detiene tracemalloc si lo inició."""
+        if not self.memoria or not tracemalloc.is_tracing():
+            return
+        _, pico = tracemalloc.get_traced_memory()
+        self.pico_memoria = max(self.pico_memoria or 0, pico)
+        if self._traza_propia:
+            tracemalloc.stop()
+            self._traza_propia = False
+
+    def combinar(self, metricas):
+        """Suma las métricas de otra instrumentación (por ejemplo, de una isla en otro proceso)."""
+        if metricas is None:
+            return
+        for fase, nanosegundos in metricas['tiempos_ns'].items():
+            self.sumar_tiempo(fase, nanosegundos)
+        for contador, cantidad in metricas['contadores'].items():
+            self.contar(contador, cantidad)
+
+    def metricas(self):
+        """Métricas acumuladas como diccionario (se guardan en ResultadoBusqueda.metricas)."""
+        return {
+            'tiempos_ns': dict(self.tiempos),
+            'contadores': dict(self.contadores),
+            'pico_memoria': self.pico_memoria
+        }
+
+class InstrumentacionNula:
+    """Instrumentación desactivada: todas sus operaciones son vacías."""
+    activa = False
+    memoria = False
+
+    _FASE = nullcontext()
+
+    def fase(self, nombre):
+        return self._FASE
+
+    def sumar_tiempo(self, fase, nanosegundos):
+        pass
+
+    def contar(self, contador, cantidad=1):
+        pass
+
+    def iniciar_memoria(self):
+        pass
+
+    def detener_memoria(self):
+        pass
+
+    def combinar(self, metricas):
+        pass
+
+    def metricas(self):
+        return None
+
+INSTRUMENTACION_NULA = InstrumentacionNula()
+
+def cronometrar(funcion, instrumentacion, fase):
+    """Envuelve `funcion` para sumar la duración de cada llamada a la fase `fase`."""
+    reloj = time.perf_counter_ns
+    sumar_tiempo = instrumentacion.sumar_tiempo
+
+    def medida(*argumentos):
+        inicio = reloj()
+        resultado = funcion(*argumentos)
+        sumar_tiempo(fase, reloj() - inicio)
+        return resultado
+    return medida
+
+def crear_instrumentacion(activa=False, memoria=False):
+    """Instrumentación nueva si `activa` o `memoria`; si no, INSTRUMENTACION_NULA."""
+    if activa or memoria:
+        return Instrumentacion(memoria=memoria)
+    return INSTRUMENTACION_NULA
@@ -1,33 +1,51 @@
 import csv
 
-def exportar_resultados(resultados, archivo='resultados.csv'):
+# Nombre de cada agente en los archivos exportados
+ALGORITMOS = {'busqueda': 'Busqueda_A*', 'genetico': 'Algoritmo_Genetico', 'dstar': 'D_Star_Lite'}
+
+def exportar_resultados(resultados, archivo='resultados.csv', resumen=None):
+    """
+    Exporta a CSV el éxito, el tiempo promedio y la longitud promedio (de
+    los éxitos) de cada experimento y agente. `resumen` (de
+    utils.agregacion.resumir) evita volver a agregar los resultados.
+    """
+    if resumen is None:
+        # pandas y scipy se cargan recién al agregar
+        from utils.agregacion import resumir_resultados
+        resumen = resumir_resultados(resultados)
+    
     with open(archivo, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['Experimento', 'Algoritmo', 'Exitos', 'Tasa_Exito', 
                         'Tiempo_Promedio', 'Longitud_Promedio'])
         
+        for fila in resumen.itertuples(index=False):
+            writer.writerow([fila.experimento, ALGORITMOS.get(fila.agente, fila.agente), fila.exitos,
+                             fila.tasa_exito, fila.tiempo_promedio, fila.longitud_promedio])
+    
+    print(f"Resultados exportados a {archivo}")
+
+def aplanar_metricas(metricas):
+    """Métricas de un resultado como pares (nombre, valor): tiempo_ns.<fase>, <contador> y pico_memoria."""
+    if metricas is None:
+        return []
+    filas = [(f"tiempo_ns.{fase}", valor) for fase, valor in sorted(metricas['tiempos_ns'].items())]
+    filas.extend(sorted(metricas['contadores'].items()))
+    if metricas.get('pico_memoria') is not None:
+        filas.append(('pico_memoria', metricas['pico_memoria']))
+    return filas
+
+def exportar_metricas(resultados, archivo='metricas.csv'):
+    """Exporta las métricas de instrumentación de cada repetición, una fila por métrica."""
+    with open(archivo, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Experimento', 'Algoritmo', 'Repeticion', 'Metrica', 'Valor'])
+        
         for exp in resultados:
-            config = exp['configuracion']
-            nombre_exp = config['nombre']
-            
-            # Datos para búsqueda
-            resultados_busqueda = exp['busqueda']
-            exitos_busqueda = sum(1 for r in resultados_busqueda if r.exito)
-            tasa_busqueda = exitos_busqueda / len(resultados_busqueda)
-            tiempo_busqueda = sum(r.tiempo_ejecucion for r in resultados_busqueda) / len(resultados_busqueda)
-            long_busqueda = sum(r.longitud_camino for r in resultados_busqueda if r.exito) / exitos_busqueda if exitos_busqueda > 0 else 0
-            
-            writer.writerow([nombre_exp, 'Busqueda_A*', exitos_busqueda, tasa_busqueda, 
-                           tiempo_busqueda, long_busqueda])
-            
-            # Datos para genético
-            resultados_genetico = exp['genetico']
-            exitos_genetico = sum(1 for r in resultados_genetico if r.exito)
-            tasa_genetico = exitos_genetico / len(resultados_genetico)
-            tiempo_genetico = sum(r.tiempo_ejecucion for r in resultados_genetico) / len(resultados_genetico)
-            long_genetico = sum(r.longitud_camino for r in resultados_genetico if r.exito) / exitos_genetico if exitos_genetico > 0 else 0
-            
-            writer.writerow([nombre_exp, 'Algoritmo_Genetico', exitos_genetico, tasa_genetico, 
-                           tiempo_genetico, long_genetico])
+            nombre_exp = exp['configuracion']['nombre']
+            for clave, algoritmo in ALGORITMOS.items():
+                for repeticion, resultado in enumerate(exp.get(clave, []), start=1):
+                    for metrica, valor in aplanar_metricas(resultado.metricas):
+                        writer.writerow([nombre_exp, algoritmo, repeticion, metrica, valor])
     
-    print(f"Resultados exportados a {archivo}")
\ No newline at end of file
+    print(f"Métricas exportadas a {archivo}")
@@ -1,87 +1,213 @@
-import matplotlib.pyplot as plt
+"""
+Gráficos de resultados.
+
+matplotlib se importa recién al dibujar. En modo sin pantalla (`mostrar=False`
+o graficar_registro) se usa el backend Agg y las figuras solo se guardan,
+sin plt.show(), de modo que los trabajos por lotes no se bloquean.
+
+graficar_registro dibuja a partir de un registro JSONL (ver
+experiments.sink): una figura comparativa de todas las configuraciones y
+una por configuración. Un manifiesto con el hash de los datos de cada
+figura permite regenerar solo las figuras cuyos datos cambiaron, y las
+figuras por configuración se dibujan en paralelo.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from utils.agregacion import tabla_resultados, resumir, resumir_resultados, pivotar
+
+# Series de cada gráfico: (agente, etiqueta, color)
+SERIES = (('busqueda', 'Búsqueda A*', 'skyblue'), ('genetico', 'Algoritmo Genético', 'lightcoral'),
+          ('dstar', 'D* Lite', 'mediumseagreen'))
+
+# Cambia con el aspecto de las figuras e invalida los manifiestos anteriores
+VERSION_GRAFICOS = 1
+
+ARCHIVO_MANIFIESTO = 'manifiesto.json'
+ARCHIVO_COMPARACION = 'comparacion_algoritmos.png'
+
+# Columnas del resumen que usa la figura comparativa
+COLUMNAS_COMPARACION = ('indice_experimento', 'experimento', 'agente', 'tasa_exito',
+                        'tiempo_promedio', 'longitud_promedio', 'eficiencia')
+
+def _pyplot(mostrar):
+    """Importa matplotlib.pyplot; sin pantalla (`mostrar=False`) selecciona antes el backend Agg."""
+    import matplotlib
+    if not mostrar:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def _hash_datos(datos, dpi):
+    """Hash de los datos de una figura, junto con la resolución y VERSION_GRAFICOS."""
+    texto = json.dumps({'datos': datos, 'dpi': dpi, 'version': VERSION_GRAFICOS},
+                       sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def _dibujar_configuracion(titulo, series, ruta, dpi):
+    """
+    Figura de una configuración: distribución de los tiempos y de las
+    longitudes de camino exitosas de cada agente. Se ejecuta también en los
+    procesos de graficar_registro, por eso recibe solo datos simples.
+    """
+    plt = _pyplot(mostrar=False)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+
+    etiquetas = [etiqueta for agente, etiqueta, _ in SERIES if agente in series]
+    tiempos = [series[agente]['tiempos'] for agente, _, _ in SERIES if agente in series]
+    longitudes = [series[agente]['longitudes'] or [0] for agente, _, _ in SERIES if agente in series]
+
+    ax1.boxplot(tiempos)
+    ax1.set_xticks(range(1, len(etiquetas) + 1))
+    ax1.set_xticklabels(etiquetas)
+    ax1.set_ylabel('Tiempo (segundos)')
+    ax1.set_title('Tiempo de Ejecución')
+    ax1.grid(True, alpha=0.3)
+
+    ax2.boxplot(longitudes)
+    ax2.set_xticks(range(1, len(etiquetas) + 1))
+    ax2.set_xticklabels([f"{etiqueta}\n({series[agente]['exitos']}/{len(series[agente]['tiempos'])} éxitos)"
+                         for (agente, etiqueta, _) in SERIES if agente in series])
+    ax2.set_ylabel('Longitud del Camino')
+    ax2.set_title('Longitud del Camino (solo éxitos)')
+    ax2.grid(True, alpha=0.3)
+
+    fig.suptitle(titulo)
+    fig.tight_layout()
+    fig.savefig(ruta, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return ruta
+
+def _dibujar_tarea(tarea):
+    return _dibujar_configuracion(*tarea)
+
+def _leer_manifiesto(directorio):
+    ruta = os.path.join(directorio, ARCHIVO_MANIFIESTO)
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _guardar_manifiesto(directorio, manifiesto):
+    """Escribe el manifiesto de forma atómica (archivo temporal + reemplazo)."""
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, indent=2, sort_keys=True)
+    os.replace(temporal, os.path.join(directorio, ARCHIVO_MANIFIESTO))
 
 class Plotter:
     """Clase para generar gráficos de resultados."""
-    
+
     @staticmethod
-    def graficar_resultados(resultados):
-        """Genera gráficos comparativos."""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-        
+    def _graficar_barras(ax, resumen, columna, ylabel, titulo):
+        """Barras agrupadas de `columna` del resumen, una serie por agente."""
+        valores = pivotar(resumen, columna)
         # Usar nombres directamente sin formateo especial
-        nombres = [exp['configuracion']['nombre'] for exp in resultados]
-        
-        # Tasa de éxito
-        exitos_busqueda = [sum(1 for r in exp['busqueda'] if r.exito) / len(exp['busqueda']) 
-                          for exp in resultados]
-        exitos_genetico = [sum(1 for r in exp['genetico'] if r.exito) / len(exp['genetico']) 
-                          for exp in resultados]
-        
+        nombres = valores.index.get_level_values('experimento')
         x = np.arange(len(nombres))
-        ax1.bar(x - 0.2, exitos_busqueda, 0.4, label='Búsqueda A*', alpha=0.7, color='skyblue')
-        ax1.bar(x + 0.2, exitos_genetico, 0.4, label='Algoritmo Genético', alpha=0.7, color='lightcoral')
-        ax1.set_xlabel('Configuración del Experimento')
-        ax1.set_ylabel('Tasa de Éxito')
-        ax1.set_title('Comparación de Tasa de Éxito')
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(nombres, rotation=45, ha='right', fontsize=8)
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        # Tiempo de ejecución
-        tiempo_busqueda = [np.mean([r.tiempo_ejecucion for r in exp['busqueda']]) 
-                          for exp in resultados]
-        tiempo_genetico = [np.mean([r.tiempo_ejecucion for r in exp['genetico']]) 
-                          for exp in resultados]
-        
-        ax2.bar(x - 0.2, tiempo_busqueda, 0.4, label='Búsqueda A*', alpha=0.7, color='skyblue')
-        ax2.bar(x + 0.2, tiempo_genetico, 0.4, label='Algoritmo Genético', alpha=0.7, color='lightcoral')
-        ax2.set_xlabel('Configuración del Experimento')
-        ax2.set_ylabel('Tiempo (segundos)')
-        ax2.set_title('Comparación de Tiempo de Ejecución')
-        ax2.set_xticks(x)
-        ax2.set_xticklabels(nombres, rotation=45, ha='right', fontsize=8)
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        # Longitud del camino (solo para éxitos)
-        long_busqueda = []
-        long_genetico = []
-        
-        for exp in resultados:
-            # Para búsqueda A*
-            caminos_exitosos_busqueda = [r.longitud_camino for r in exp['busqueda'] if r.exito]
-            long_busqueda.append(np.mean(caminos_exitosos_busqueda) if caminos_exitosos_busqueda else 0)
-            
-            # Para algoritmo genético
-            caminos_exitosos_genetico = [r.longitud_camino for r in exp['genetico'] if r.exito]
-            long_genetico.append(np.mean(caminos_exitosos_genetico) if caminos_exitosos_genetico else 0)
-        
-        ax3.bar(x - 0.2, long_busqueda, 0.4, label='Búsqueda A*', alpha=0.7, color='skyblue')
-        ax3.bar(x + 0.2, long_genetico, 0.4, label='Algoritmo Genético', alpha=0.7, color='lightcoral')
-        ax3.set_xlabel('Configuración del Experimento')
-        ax3.set_ylabel('Longitud del Camino')
-        ax3.set_title('Comparación de Longitud del Camino (solo éxitos)')
-        ax3.set_xticks(x)
-        ax3.set_xticklabels(nombres, rotation=45, ha='right', fontsize=8)
-        ax3.legend()
-        ax3.grid(True, alpha=0.3)
-        
-        # Eficiencia (éxito/tiempo)
-        eficiencia_busqueda = [e/t if t > 0 else 0 for e, t in zip(exitos_busqueda, tiempo_busqueda)]
-        eficiencia_genetico = [e/t if t > 0 else 0 for e, t in zip(exitos_genetico, tiempo_genetico)]
-        
-        ax4.bar(x - 0.2, eficiencia_busqueda, 0.4, label='Búsqueda A*', alpha=0.7, color='skyblue')
-        ax4.bar(x + 0.2, eficiencia_genetico, 0.4, label='Algoritmo Genético', alpha=0.7, color='lightcoral')
-        ax4.set_xlabel('Configuración del Experimento')
-        ax4.set_ylabel('Eficiencia (Éxito/Tiempo)')
-        ax4.set_title('Comparación de Eficiencia')
-        ax4.set_xticks(x)
-        ax4.set_xticklabels(nombres, rotation=45, ha='right', fontsize=8)
-        ax4.legend()
-        ax4.grid(True, alpha=0.3)
-        
+
+        # Las series de los agentes presentes reparten un ancho de 0.8 por experimento
+        series = [serie for serie in SERIES if serie[0] in valores]
+        ancho = 0.8 / max(len(series), 1)
+        for posicion, (agente, etiqueta, color) in enumerate(series):
+            desplazamiento = (posicion - (len(series) - 1) / 2) * ancho
+            ax.bar(x + desplazamiento, valores[agente].fillna(0), ancho, label=etiqueta, alpha=0.7, color=color)
+        ax.set_xlabel('Configuración del Experimento')
+        ax.set_ylabel(ylabel)
+        ax.set_title(titulo)
+        ax.set_xticks(x)
+        ax.set_xticklabels(nombres, rotation=45, ha='right', fontsize=8)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    @staticmethod
+    def graficar_resultados(resultados, resumen=None, archivo=ARCHIVO_COMPARACION, dpi=300, mostrar=True):
+        """
+        Genera gráficos comparativos. `resumen` (de utils.agregacion.resumir)
+        evita volver a agregar los resultados. Con `mostrar=False` la figura
+        solo se guarda (backend Agg, sin plt.show()).
+        """
+        if resumen is None:
+            resumen = resumir_resultados(resultados)
+
+        plt = _pyplot(mostrar)
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+
+        Plotter._graficar_barras(ax1, resumen, 'tasa_exito', 'Tasa de Éxito', 'Comparación de Tasa de Éxito')
+        Plotter._graficar_barras(ax2, resumen, 'tiempo_promedio', 'Tiempo (segundos)',
+                                 'Comparación de Tiempo de Ejecución')
+        Plotter._graficar_barras(ax3, resumen, 'longitud_promedio', 'Longitud del Camino',
+                                 'Comparación de Longitud del Camino (solo éxitos)')
+        Plotter._graficar_barras(ax4, resumen, 'eficiencia', 'Eficiencia (Éxito/Tiempo)',
+                                 'Comparación de Eficiencia')
+
         plt.tight_layout()
-        plt.savefig('comparacion_algoritmos.png', dpi=300, bbox_inches='tight')
-        plt.show()
\ No newline at end of file
+        plt.savefig(archivo, dpi=dpi, bbox_inches='tight')
+        if mostrar:
+            plt.show()
+        else:
+            plt.close(fig)
+
+    @staticmethod
+    def graficar_registro(registro, directorio='graficos', procesos=None, dpi=150, dpi_comparacion=300):
+        """
+        Dibuja, sin pantalla, las figuras de un registro JSONL en `directorio`:
+        la comparación de todas las configuraciones (ARCHIVO_COMPARACION) y
+        una figura por configuración (configuracion_<clave>.png, con la clave
+        del registro).
+
+        Solo se dibujan las figuras que no existen o cuyos datos cambiaron
+        desde la última vez, según el hash guardado en ARCHIVO_MANIFIESTO. Las
+        figuras por configuración se reparten entre `procesos` procesos (por
+        defecto, uno por CPU). Devuelve las rutas de las figuras dibujadas.
+        """
+        from experiments.sink import cargar_resultados, clave_configuracion
+
+        os.makedirs(directorio, exist_ok=True)
+        resultados = cargar_resultados(registro)
+        tabla = tabla_resultados(resultados)
+        resumen = resumir(tabla)
+        manifiesto = _leer_manifiesto(directorio)
+        nuevo_manifiesto = {}
+        dibujadas = []
+
+        def pendiente(archivo, datos, figura_dpi):
+            """Registra el hash de la figura e indica si hay que dibujarla."""
+            huella = _hash_datos(datos, figura_dpi)
+            nuevo_manifiesto[archivo] = huella
+            return manifiesto.get(archivo) != huella or not os.path.exists(os.path.join(directorio, archivo))
+
+        datos_comparacion = resumen[list(COLUMNAS_COMPARACION)].astype({'experimento': str, 'agente': str})
+        if len(resumen) and pendiente(ARCHIVO_COMPARACION, datos_comparacion.to_dict('list'), dpi_comparacion):
+            ruta = os.path.join(directorio, ARCHIVO_COMPARACION)
+            Plotter.graficar_resultados(resultados, resumen, archivo=ruta, dpi=dpi_comparacion, mostrar=False)
+            dibujadas.append(ruta)
+
+        # Datos de cada figura por configuración: archivo -> (título, series por agente)
+        figuras = {}
+        for (indice, agente), filas in tabla.groupby(['indice_experimento', 'agente'], sort=False, observed=True):
+            configuracion = resultados[indice]['configuracion']
+            archivo = f"configuracion_{clave_configuracion(configuracion)}.png"
+            exito = filas['exito'].to_numpy()
+            figuras.setdefault(archivo, (configuracion['nombre'], {}))[1][agente] = {
+                'tiempos': filas['tiempo_ejecucion'].tolist(),
+                'longitudes': filas['longitud_camino'].to_numpy()[exito].tolist(),
+                'exitos': int(exito.sum())
+            }
+
+        tareas = [(titulo, series, os.path.join(directorio, archivo), dpi)
+                  for archivo, (titulo, series) in figuras.items()
+                  if pendiente(archivo, {'titulo': titulo, 'series': series}, dpi)]
+
+        if len(tareas) > 1 and procesos != 1:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                dibujadas.extend(ejecutor.map(_dibujar_tarea, tareas))
+        else:
+            dibujadas.extend(_dibujar_tarea(tarea) for tarea in tareas)
+
+        _guardar_manifiesto(directorio, nuevo_manifiesto)
+        return dibujadas